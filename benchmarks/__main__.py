@@ -0,0 +1,176 @@
+"""Lance les benchmarks de PhotoDedup.
+
+Usage :
+    python -m benchmarks [--profile small] [--output results.json]
+                         [--thresholds benchmarks/thresholds.json]
+                         [--baseline previous.json --tolerance 0.25 --min-delta-ms 5]
+
+Le code de sortie vaut 1 si une médiane dépasse son seuil absolu, ou si le
+meilleur temps régresse à la fois de plus de `tolerance` et de plus de
+`min-delta-ms` par rapport à la référence.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from dataclasses import asdict, replace
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.cases import COLD_CACHE_SUPPORTED, build_benchmarks, measure
+from benchmarks.synthetic import LibrarySpec, generate_library
+
+DEFAULT_THRESHOLDS = Path(__file__).with_name("thresholds.json")
+
+PROFILES = {
+    "tiny": LibrarySpec(file_count=100, depth=2, fanout=2, hardlink_ratio=0.05),
+    "small": LibrarySpec(file_count=1_000, depth=3, fanout=4, hardlink_ratio=0.05),
+    "medium": LibrarySpec(file_count=10_000, depth=4, fanout=5, hardlink_ratio=0.05),
+}
+
+LARGE_FILE_SIZE = 32 * 1024**2
+
+DEFAULT_REPEAT = 5
+# Plus de répétitions quand une référence sert de garde-fou : moins de bruit
+GATED_REPEAT = 15
+DEFAULT_MIN_DELTA_MS = 5.0
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--files", type=int, help="Remplace file_count du profil.")
+    parser.add_argument("--seed", type=int, help="Remplace la graine du profil.")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        help=f"Mesures par cas ({DEFAULT_REPEAT}, {GATED_REPEAT} avec --baseline).",
+    )
+    parser.add_argument("--filter", default="", help="Ne garder que les cas contenant ce texte.")
+    parser.add_argument("--workdir", type=Path, help="Dossier où générer la bibliothèque.")
+    parser.add_argument("--output", type=Path, help="Fichier JSON de résultats (stdout sinon).")
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS)
+    parser.add_argument("--baseline", type=Path, help="Résultats JSON de référence.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=DEFAULT_MIN_DELTA_MS,
+        help="Écart minimal (ms) avec la référence pour signaler une régression.",
+    )
+    args = parser.parse_args(argv)
+    if args.repeat is None:
+        args.repeat = GATED_REPEAT if args.baseline else DEFAULT_REPEAT
+    return args
+
+
+def check_regressions(
+    report: dict,
+    thresholds: dict,
+    baseline: dict | None,
+    tolerance: float,
+    min_delta: float = DEFAULT_MIN_DELTA_MS / 1000,
+) -> list[str]:
+    """Compare les médianes aux seuils absolus et, si fournie, la référence.
+
+    Les seuils absolus ne valent que pour la spécification exacte du profil, et
+    une référence mesurée sur une autre bibliothèque est refusée. Face à la
+    référence, on compare les meilleurs temps (`min_s`, moins sensibles au bruit)
+    et un écart inférieur à `min_delta` secondes n'est jamais une régression.
+    """
+    failures = []
+    meta = report["meta"]
+    limits = {}
+    profile = PROFILES.get(meta["profile"])
+    if profile is not None and meta["spec"] == asdict(profile):
+        limits = thresholds.get(meta["profile"], {})
+
+    previous = {}
+    if baseline is not None:
+        if baseline["meta"]["spec"] == meta["spec"]:
+            previous = {r["name"]: r for r in baseline["results"]}
+        else:
+            failures.append("référence mesurée sur une autre bibliothèque (spec différente)")
+
+    for result in report["results"]:
+        name, median = result["name"], result["median_s"]
+        limit = limits.get(name, {}).get("max_median_s")
+        if limit is not None and median > limit:
+            failures.append(f"{name} : {median:.4f}s > seuil {limit:.4f}s")
+        if name in previous:
+            best, reference = result["min_s"], previous[name]["min_s"]
+            if best > reference * (1 + tolerance) and best - reference > min_delta:
+                failures.append(
+                    f"{name} : {best:.4f}s > référence {reference:.4f}s (+{tolerance:.0%})"
+                )
+    return failures
+
+
+def run(args: argparse.Namespace, workdir: Path) -> dict:
+    spec = PROFILES[args.profile]
+    if args.files is not None:
+        spec = replace(spec, file_count=args.files)
+    if args.seed is not None:
+        spec = replace(spec, seed=args.seed)
+
+    manifest = generate_library(workdir / "library", spec)
+    large_file = workdir / "large.jpg"
+    large_file.write_bytes(os.urandom(LARGE_FILE_SIZE))
+    if hasattr(os, "sync"):
+        os.sync()
+
+    results = []
+    cache_files = [*manifest.files, large_file]
+    for benchmark in build_benchmarks(manifest, large_file):
+        if args.filter not in benchmark.name:
+            continue
+        result = measure(benchmark, args.repeat, cache_files)
+        print(f"{result.name:<45} {result.median * 1000:>10.2f} ms", file=sys.stderr)
+        results.append(result.as_dict())
+
+    return {
+        "meta": {
+            "profile": args.profile,
+            "spec": asdict(spec),
+            "library": manifest.as_dict(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cold_cache_supported": COLD_CACHE_SUPPORTED,
+            "date": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    with tempfile.TemporaryDirectory(dir=args.workdir) as tmp:
+        report = run(args, Path(tmp))
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+    thresholds = {}
+    if args.thresholds and args.thresholds.exists():
+        thresholds = json.loads(args.thresholds.read_text(encoding="utf-8"))
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    failures = check_regressions(
+        report, thresholds, baseline, args.tolerance, args.min_delta_ms / 1000
+    )
+    for failure in failures:
+        print(f"❌ Régression : {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+"""Cas de benchmark de PhotoDedup.
+
+Chaque cas mesure une fonction du projet sur une bibliothèque synthétique
+(voir `benchmarks.synthetic`). Les cas « micro » isolent une fonction
+(hash, regroupement par taille), les cas « e2e » enchaînent scan et détection.
+
+Les variantes `cold` vident le cache de pages des fichiers de la bibliothèque
+avant chaque mesure via `posix_fadvise(POSIX_FADV_DONTNEED)`. Sur les systèmes
+qui ne le supportent pas, elles sont ignorées et signalées dans les résultats.
+"""
+
+import os
+import statistics
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+
+from benchmarks.synthetic import LibraryManifest
+from photodedup.domain.models import ImageFile
+from photodedup.domain.services import find_exact_duplicates, group_by_size
+from photodedup.infrastructure.file_scanner import scan_directory
+from photodedup.infrastructure.hasher import compute_hash, compute_partial_hash
+
+COLD_CACHE_SUPPORTED = hasattr(os, "posix_fadvise")
+
+
+@dataclass
+class Benchmark:
+    """Un cas de benchmark.
+
+    Attributes:
+        name: Identifiant stable, utilisé comme clé dans les seuils.
+        kind: 'micro' ou 'e2e'.
+        cache: 'warm' ou 'cold'.
+        run: Fonction mesurée, renvoie le nombre d'éléments traités.
+        nbytes: Octets lus par exécution (0 si non pertinent).
+    """
+
+    name: str
+    kind: str
+    cache: str
+    run: Callable[[], int]
+    nbytes: int = 0
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    kind: str
+    cache: str
+    repeat: int
+    timings: list[float]
+    items: int
+    nbytes: int
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    def as_dict(self) -> dict:
+        median = self.median
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "cache": self.cache,
+            "repeat": self.repeat,
+            "min_s": min(self.timings),
+            "median_s": median,
+            "mean_s": statistics.fmean(self.timings),
+            "stdev_s": statistics.stdev(self.timings) if len(self.timings) > 1 else 0.0,
+            "items": self.items,
+            "items_per_s": self.items / median if median > 0 else None,
+            "bytes": self.nbytes,
+            "mb_per_s": self.nbytes / 1024**2 / median if self.nbytes and median > 0 else None,
+        }
+
+
+def drop_file_cache(paths: Iterable[Path]) -> None:
+    """Demande au noyau d'oublier les pages en cache des fichiers donnés.
+
+    Les pages sales ne sont pas évincées : appeler `os.sync()` après la génération.
+    """
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def measure(benchmark: Benchmark, repeat: int, files: list[Path]) -> BenchmarkResult:
+    """Exécute `benchmark` `repeat` fois, après une exécution de chauffe non mesurée.
+
+    La chauffe suffit à remplir le cache pour les variantes `warm`.
+    """
+    items = benchmark.run()
+    timings = []
+    for _ in range(repeat):
+        if benchmark.cache == "cold":
+            drop_file_cache(files)
+        start = perf_counter()
+        items = benchmark.run()
+        timings.append(perf_counter() - start)
+    return BenchmarkResult(
+        name=benchmark.name,
+        kind=benchmark.kind,
+        cache=benchmark.cache,
+        repeat=repeat,
+        timings=timings,
+        items=items,
+        nbytes=benchmark.nbytes,
+    )
+
+
+def build_benchmarks(manifest: LibraryManifest, large_file: Path) -> list[Benchmark]:
+    """Construit la liste des cas pour une bibliothèque donnée."""
+    images = [ImageFile.from_path(path) for path in manifest.files]
+    candidates = [img for group in group_by_size(images).values() for img in group]
+    candidate_bytes = sum(img.size for img in candidates)
+    large_size = large_file.stat().st_size
+
+    def hash_large() -> int:
+        compute_hash(large_file)
+        return 1
+
+    def hash_full_all() -> int:
+        for img in images:
+            compute_hash(img.path)
+        return len(images)
+
+    def hash_partial_all() -> int:
+        for img in images:
+            compute_partial_hash(img.path)
+        return len(images)
+
+    def group_sizes() -> int:
+        group_by_size(images)
+        return len(images)
+
+    def scan() -> int:
+        found, _, _, _ = scan_directory(manifest.root)
+        return len(found)
+
+    def find_full() -> int:
+        find_exact_duplicates(images, compute_hash)
+        return len(candidates)
+
+    def find_partial() -> int:
+        find_exact_duplicates(images, compute_partial_hash)
+        return len(candidates)
+
+    def pipeline() -> int:
+        found, _, _, _ = scan_directory(manifest.root)
+        find_exact_duplicates(found, compute_hash)
+        return len(found)
+
+    benchmarks = [
+        Benchmark("micro.group_by_size", "micro", "warm", group_sizes),
+        Benchmark("e2e.scan_directory", "e2e", "warm", scan),
+    ]
+    for cache in ("warm", "cold") if COLD_CACHE_SUPPORTED else ("warm",):
+        benchmarks += [
+            Benchmark(f"micro.compute_partial_hash.{cache}", "micro", cache, hash_partial_all),
+            Benchmark(f"micro.compute_hash_large.{cache}", "micro", cache, hash_large, large_size),
+            Benchmark(
+                f"micro.compute_hash.{cache}", "micro", cache, hash_full_all, manifest.total_bytes
+            ),
+            Benchmark(
+                f"e2e.find_exact_duplicates.{cache}", "e2e", cache, find_full, candidate_bytes
+            ),
+            Benchmark(f"e2e.find_exact_duplicates_partial.{cache}", "e2e", cache, find_partial),
+            Benchmark(f"e2e.pipeline.{cache}", "e2e", cache, pipeline, candidate_bytes),
+        ]
+    return benchmarks
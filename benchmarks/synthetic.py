@@ -0,0 +1,194 @@
+"""Générateur déterministe de bibliothèques photo synthétiques.
+
+Ce module crée, à partir d'une graine, une arborescence de faux fichiers image
+reproductible à l'octet près. Il sert de jeu de données commun à tous les
+benchmarks afin que chaque mesure soit faite sur les mêmes données.
+
+Contenu:
+    - LibrarySpec: paramètres de la bibliothèque (nombre de fichiers, profondeur, tailles...).
+    - LibraryManifest: résumé de ce qui a été réellement écrit sur le disque.
+    - generate_library: écrit la bibliothèque dans un dossier.
+"""
+
+import math
+import os
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# En-tête JFIF minimal : les fichiers générés ressemblent à de vrais JPEG
+JPEG_HEADER = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+JPEG_TRAILER = b"\xff\xd9"
+
+SIZE_DISTRIBUTIONS = frozenset({"uniform", "lognormal"})
+
+
+@dataclass(frozen=True)
+class LibrarySpec:
+    """Paramètres d'une bibliothèque synthétique.
+
+    Attributes:
+        file_count: Nombre total de fichiers image (doublons et liens durs compris).
+        depth: Profondeur maximale de l'arborescence.
+        fanout: Nombre de sous-dossiers par dossier.
+        min_size: Taille minimale d'un fichier en octets.
+        max_size: Taille maximale d'un fichier en octets.
+        size_distribution: 'uniform' ou 'lognormal' (tailles réalistes de photos).
+        duplicate_ratio: Part des fichiers qui sont des copies d'un autre fichier.
+        shared_header_ratio: Part des originaux qui partagent le même en-tête de
+            `shared_header_size` octets (piège pour le hash partiel).
+        shared_header_size: Taille de l'en-tête commun.
+        hardlink_ratio: Part des fichiers qui sont des liens durs vers un autre fichier.
+        seed: Graine du générateur pseudo-aléatoire.
+    """
+
+    file_count: int = 1000
+    depth: int = 3
+    fanout: int = 4
+    min_size: int = 8 * 1024
+    max_size: int = 256 * 1024
+    size_distribution: str = "lognormal"
+    duplicate_ratio: float = 0.2
+    shared_header_ratio: float = 0.1
+    shared_header_size: int = 4096
+    hardlink_ratio: float = 0.0
+    seed: int = 42
+
+    def __post_init__(self) -> None:
+        if self.file_count < 0:
+            raise ValueError("file_count doit être positif.")
+        if not 0 < self.min_size <= self.max_size:
+            raise ValueError("Il faut 0 < min_size <= max_size.")
+        if self.size_distribution not in SIZE_DISTRIBUTIONS:
+            raise ValueError(f"Distribution inconnue : {self.size_distribution}")
+        for name in ("duplicate_ratio", "shared_header_ratio", "hardlink_ratio"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} doit être compris entre 0 et 1.")
+        if self.duplicate_ratio + self.hardlink_ratio > 1.0:
+            raise ValueError("duplicate_ratio + hardlink_ratio ne peut pas dépasser 1.")
+
+
+@dataclass
+class LibraryManifest:
+    """Résumé d'une bibliothèque générée.
+
+    Attributes:
+        root: Dossier racine de la bibliothèque.
+        files: Chemins de tous les fichiers image, dans l'ordre de création.
+        unique_files: Nombre de fichiers au contenu original.
+        duplicate_files: Nombre de copies (contenu identique, inode différent).
+        hardlinks: Nombre de liens durs créés.
+        shared_header_files: Nombre d'originaux partageant l'en-tête commun.
+        total_bytes: Taille apparente totale (liens durs comptés plusieurs fois).
+    """
+
+    root: Path
+    files: list[Path] = field(default_factory=list)
+    unique_files: int = 0
+    duplicate_files: int = 0
+    hardlinks: int = 0
+    shared_header_files: int = 0
+    total_bytes: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "root": str(self.root),
+            "files": len(self.files),
+            "unique_files": self.unique_files,
+            "duplicate_files": self.duplicate_files,
+            "hardlinks": self.hardlinks,
+            "shared_header_files": self.shared_header_files,
+            "total_bytes": self.total_bytes,
+        }
+
+
+def build_directories(root: Path, depth: int, fanout: int) -> list[Path]:
+    """Liste les dossiers d'un arbre complet de profondeur `depth` (racine comprise)."""
+    directories = [root]
+    level = [root]
+    for d in range(depth):
+        level = [parent / f"dir_{d}_{i}" for parent in level for i in range(fanout)]
+        directories.extend(level)
+    return directories
+
+
+def draw_size(rng: random.Random, spec: LibrarySpec) -> int:
+    if spec.size_distribution == "uniform":
+        return rng.randint(spec.min_size, spec.max_size)
+
+    # Lognormale centrée sur la moyenne géométrique des bornes, puis tronquée
+    mu = (math.log(spec.min_size) + math.log(spec.max_size)) / 2
+    size = int(rng.lognormvariate(mu, 0.5))
+    return min(max(size, spec.min_size), spec.max_size)
+
+
+def make_content(rng: random.Random, size: int, header: bytes = b"") -> bytes:
+    """Contenu pseudo-JPEG de `size` octets, commençant par `header` si fourni."""
+    prefix = header or JPEG_HEADER
+    body_size = max(size - len(prefix) - len(JPEG_TRAILER), 0)
+    return (prefix + rng.randbytes(body_size) + JPEG_TRAILER)[: max(size, len(prefix))]
+
+
+def generate_library(root: Path, spec: LibrarySpec) -> LibraryManifest:
+    """Écrit une bibliothèque synthétique dans `root` et renvoie son manifeste.
+
+    Deux appels avec la même spécification produisent exactement les mêmes
+    chemins et les mêmes contenus.
+    """
+    rng = random.Random(spec.seed)
+    root.mkdir(parents=True, exist_ok=True)
+    directories = build_directories(root, spec.depth, spec.fanout)
+    for directory in directories:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    n_hardlinks = int(spec.file_count * spec.hardlink_ratio)
+    n_duplicates = int(spec.file_count * spec.duplicate_ratio)
+    n_unique = spec.file_count - n_hardlinks - n_duplicates
+    if n_unique == 0 and spec.file_count > 0:
+        raise ValueError("La spécification ne laisse aucun fichier original.")
+
+    shared_header = JPEG_HEADER + rng.randbytes(max(spec.shared_header_size - len(JPEG_HEADER), 0))
+    manifest = LibraryManifest(root=root)
+    originals: list[Path] = []
+
+    def next_path(index: int) -> Path:
+        return rng.choice(directories) / f"IMG_{index:07d}.jpg"
+
+    for index in range(n_unique):
+        size = draw_size(rng, spec)
+        header = b""
+        if rng.random() < spec.shared_header_ratio and size > len(shared_header):
+            header = shared_header
+            manifest.shared_header_files += 1
+        data = make_content(rng, size, header)
+        path = next_path(index)
+        path.write_bytes(data)
+        originals.append(path)
+        manifest.files.append(path)
+        manifest.total_bytes += len(data)
+    manifest.unique_files = n_unique
+
+    for index in range(n_unique, n_unique + n_duplicates):
+        source = rng.choice(originals)
+        data = source.read_bytes()
+        path = next_path(index)
+        path.write_bytes(data)
+        manifest.files.append(path)
+        manifest.duplicate_files += 1
+        manifest.total_bytes += len(data)
+
+    for index in range(n_unique + n_duplicates, spec.file_count):
+        source = rng.choice(originals)
+        path = next_path(index)
+        try:
+            os.link(source, path)
+        except OSError:
+            # Système de fichiers sans liens durs : on retombe sur une copie
+            path.write_bytes(source.read_bytes())
+            manifest.duplicate_files += 1
+        else:
+            manifest.hardlinks += 1
+        manifest.files.append(path)
+        manifest.total_bytes += source.stat().st_size
+
+    return manifest
@@ -1,21 +1,43 @@
+import argparse
 import sys
 from pathlib import Path
 from time import perf_counter
 
-from photodedup.domain.services import find_exact_duplicates
+from photodedup.domain.services import find_exact_duplicates, iter_exact_duplicates
 from photodedup.infrastructure.file_scanner import scan_directory
 from photodedup.infrastructure.hasher import compute_hash, compute_partial_hash
+from photodedup.infrastructure.report_writer import REPORT_FORMATS, open_report
 from photodedup.ui.formatters import format_size
 
 
-def main() -> int:
-    if len(sys.argv) < 2 or len(sys.argv) > 2:
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m photodedup")
+    parser.add_argument("path", nargs="?", type=Path)
+    parser.add_argument(
+        "--format", choices=sorted(REPORT_FORMATS), help="Rapport lisible par machine."
+    )
+    parser.add_argument("--output", type=Path, help="Fichier du rapport (stdout par défaut).")
+    parser.add_argument("--top", type=int, help="Ne garder que les K plus gros groupes.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.path is None:
         print("Erreur : Chemin du dossier manquant")
-        print("Usage : python -m photodedup.main <chemin_dossier>")
+        print("Usage : python -m photodedup <chemin_dossier> [--format ndjson|csv]")
+        return 1
+    if args.top is not None and args.top <= 0:
+        print("Erreur : --top doit être strictement positif")
         return 1
+    if not args.format and (args.output is not None or args.top is not None):
+        print("Erreur : --output et --top nécessitent --format ndjson|csv")
+        return 1
+
+    if args.format:
+        return write_report(args)
 
-    args_str = sys.argv[1]
-    path = Path(args_str)
+    path = args.path
 
     print(f"📂 Scan de : {path.name}")
     print("⏳ Scan en cours...\n")
@@ -93,6 +115,37 @@ def main() -> int:
     return 0
 
 
+def write_report(args: argparse.Namespace) -> int:
+    """Scanne puis écrit le rapport au fil de la détection (messages sur stderr).
+
+    Les groupes de doublons sont écrits dès qu'ils sont trouvés. Les erreurs et
+    entrées ignorées, elles, sont collectées par `scan_directory` et écrites
+    d'un bloc à la fin du parcours, avant le hachage : le rapport n'est ouvert
+    qu'une fois le dossier validé, pour ne pas laisser de fichier vide en cas
+    de chemin invalide.
+    """
+    try:
+        images, errors, skipped_folders, skipped_files = scan_directory(args.path)
+    except (FileNotFoundError, NotADirectoryError, ValueError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 1
+
+    try:
+        with open_report(args.format, args.output, args.top) as report:
+            for error in errors:
+                report.write_error(error)
+            for folder in skipped_folders:
+                report.write_skipped_folder(folder)
+            for file in skipped_files:
+                report.write_skipped_file(file)
+            report.write_groups(iter_exact_duplicates(images, compute_hash))
+    except OSError as e:
+        print(f"Erreur : écriture du rapport impossible ({e})", file=sys.stderr)
+        return 1
+
+    return 0
+
+
 def print_list_section(title, items, message, kind):
     if title == "Images":
         print(f"📋 {title} :")
@@ -0,0 +1,227 @@
+"""Tâches longues annulables, indépendantes de tout framework graphique.
+
+Une tâche s'exécute de façon bloquante dans le thread de son choix (thread Python,
+QThread...). L'annulation est coopérative : elle est vérifiée entre deux fichiers,
+et la tâche renvoie alors ses résultats partiels au lieu de lever une exception.
+
+L'avancement est regroupé et limité dans le temps : au plus un `ProgressEvent`
+toutes les `interval` secondes, quel que soit le nombre de fichiers traités,
+pour ne pas saturer la boucle d'événements de l'interface.
+
+Contenu:
+    - JobCancelledError: levée en interne pour interrompre une tâche.
+    - CancellationToken: drapeau d'annulation partagé entre threads.
+    - ProgressEvent / ProgressThrottle: avancement regroupé et limité.
+    - ScanResult / DuplicateScanJob: scan + détection des doublons exacts.
+    - JobHandle / run_in_background: exécution dans un thread Python.
+"""
+
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+from photodedup.domain.models import DuplicateGroup, ImageFile
+from photodedup.domain.services import group_by_size, iter_exact_duplicates
+from photodedup.infrastructure.file_scanner import scan_directory
+from photodedup.infrastructure.hasher import compute_hash
+
+DEFAULT_PROGRESS_INTERVAL = 0.1
+
+
+class JobCancelledError(Exception):
+    """L'annulation a été demandée pendant l'exécution."""
+
+
+class CancellationToken:
+    """Drapeau d'annulation, sûr entre threads."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise JobCancelledError()
+
+
+@dataclass
+class ProgressEvent:
+    """Avancement d'une phase.
+
+    Attributes:
+        phase: 'scan' ou 'hash'.
+        done: Nombre d'éléments traités depuis le début de la phase.
+        total: Nombre total attendu, ou None s'il est inconnu (scan).
+        batch: Résultats apparus depuis l'événement précédent (ex: groupes de doublons).
+        elapsed: Secondes écoulées depuis le début de la phase.
+    """
+
+    phase: str
+    done: int
+    total: int | None
+    batch: list
+    elapsed: float
+
+
+class ProgressThrottle:
+    """Accumule l'avancement et n'émet qu'un événement par intervalle de temps."""
+
+    def __init__(
+        self,
+        phase: str,
+        emit: Callable[[ProgressEvent], None],
+        interval: float = DEFAULT_PROGRESS_INTERVAL,
+        total: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.phase = phase
+        self.emit = emit
+        self.interval = interval
+        self.total = total
+        self.clock = clock
+        self.done = 0
+        self._batch: list = []
+        self._start = self._last = clock()
+
+    def advance(self, count: int = 1, items: Iterable = ()) -> None:
+        self.done += count
+        self._batch.extend(items)
+        if self.clock() - self._last >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Émet immédiatement l'état courant (à appeler en fin de phase)."""
+        now = self.clock()
+        batch, self._batch = self._batch, []
+        self._last = now
+        self.emit(ProgressEvent(self.phase, self.done, self.total, batch, now - self._start))
+
+
+@dataclass
+class ScanResult:
+    """Résultat, éventuellement partiel, d'un `DuplicateScanJob`."""
+
+    images: list[ImageFile] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    skipped_folders: list[Path] = field(default_factory=list)
+    skipped_files: list[Path] = field(default_factory=list)
+    groups: list[DuplicateGroup] = field(default_factory=list)
+    cancelled: bool = False
+
+
+class Job(Protocol):
+    def run(self) -> Any: ...
+
+    def cancel(self) -> None: ...
+
+
+class DuplicateScanJob:
+    """Scanne un dossier puis cherche les doublons exacts.
+
+    `on_progress` est appelé depuis le thread qui exécute `run()`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        hasher: Callable[[Path], str] = compute_hash,
+        on_progress: Callable[[ProgressEvent], None] | None = None,
+        interval: float = DEFAULT_PROGRESS_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = path
+        self.hasher = hasher
+        self.on_progress = on_progress
+        self.interval = interval
+        self.clock = clock
+        self.token = CancellationToken()
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def _emit(self, event: ProgressEvent) -> None:
+        if self.on_progress is not None:
+            self.on_progress(event)
+
+    def _throttle(self, phase: str, total: int | None = None) -> ProgressThrottle:
+        return ProgressThrottle(phase, self._emit, self.interval, total, self.clock)
+
+    def run(self) -> ScanResult:
+        result = ScanResult()
+
+        scan_progress = self._throttle("scan")
+        result.images, result.errors, result.skipped_folders, result.skipped_files = scan_directory(
+            self.path,
+            on_file=lambda _: scan_progress.advance(),
+            should_stop=lambda: self.token.cancelled,
+        )
+        scan_progress.flush()
+        if self.token.cancelled:
+            result.cancelled = True
+            return result
+
+        candidates = sum(len(group) for group in group_by_size(result.images).values())
+        hash_progress = self._throttle("hash", total=candidates)
+
+        def hasher(path: Path) -> str:
+            self.token.raise_if_cancelled()
+            try:
+                return self.hasher(path)
+            finally:
+                # Un fichier illisible (ignoré par la détection) compte aussi comme traité
+                hash_progress.advance()
+
+        try:
+            for group in iter_exact_duplicates(result.images, hasher):
+                result.groups.append(group)
+                hash_progress.advance(0, [group])
+        except JobCancelledError:
+            result.cancelled = True
+        hash_progress.flush()
+
+        return result
+
+
+class JobHandle:
+    """Tâche lancée dans un thread Python (voir `run_in_background`)."""
+
+    def __init__(self, job: Job) -> None:
+        self.job = job
+        self.result: Any = None
+        self.error: Exception | None = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        try:
+            self.result = self.job.run()
+        except Exception as e:
+            self.error = e
+
+    def start(self) -> "JobHandle":
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self.job.cancel()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Attend la fin de la tâche ; renvoie False si `timeout` est dépassé."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+
+def run_in_background(job: Job) -> JobHandle:
+    return JobHandle(job).start()
@@ -1,6 +1,6 @@
 from collections import defaultdict
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
 from photodedup.domain.models import DuplicateGroup, ImageFile
 
@@ -17,12 +17,11 @@ def remove_singletons(grouped_images: dict) -> dict:
     return {k: v for k, v in grouped_images.items() if len(v) > 1}
 
 
-def find_exact_duplicates(images, hasher: Callable[[Path], str]) -> list[DuplicateGroup]:
-    result = []
+def iter_exact_duplicates(images, hasher: Callable[[Path], str]) -> Iterator[DuplicateGroup]:
     grouped_images_by_size = group_by_size(images)
 
-    grouped_by_hash = defaultdict(list)
     for size, imagegroup in grouped_images_by_size.items():
+        grouped_by_hash = defaultdict(list)
         for image in imagegroup:
             try:
                 h = hasher(image.path)
@@ -30,8 +29,10 @@ def find_exact_duplicates(images, hasher: Callable[[Path], str]) -> list[Duplica
             except OSError:
                 continue
 
-    for hash, group in grouped_by_hash.items():
-        if len(group) >= 2:
-            result.append(DuplicateGroup(hash, group, "exact"))
+        for hash, group in grouped_by_hash.items():
+            if len(group) >= 2:
+                yield DuplicateGroup(hash, group, "exact")
+
 
-    return result
+def find_exact_duplicates(images, hasher: Callable[[Path], str]) -> list[DuplicateGroup]:
+    return list(iter_exact_duplicates(images, hasher))
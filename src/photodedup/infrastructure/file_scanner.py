@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Callable
 
 from photodedup.domain.models import ImageFile, is_image_extension
 
@@ -32,7 +33,16 @@ def format_scan_error(error: OSError, source: str) -> str:
         return f"{source} - Erreur d'accès : {location} ({error.strerror})"
 
 
-def scan_directory(path: Path) -> tuple[list[ImageFile], list[str], list[Path], list[Path]]:
+def scan_directory(
+    path: Path,
+    on_file: Callable[[Path], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> tuple[list[ImageFile], list[str], list[Path], list[Path]]:
+    """Parcourt `path` et classe les fichiers rencontrés.
+
+    `on_file` est appelé pour chaque fichier vu. Si `should_stop` renvoie True,
+    le parcours s'arrête et les résultats partiels sont renvoyés.
+    """
     if not path.exists():
         raise FileNotFoundError(f"Ce ({path}) n'existe pas.")
     if not path.is_dir():
@@ -47,11 +57,19 @@ def scan_directory(path: Path) -> tuple[list[ImageFile], list[str], list[Path],
 
     try:
         for dirpath, dirnames, filenames in path.walk(on_error=handle_error):
+            if should_stop is not None and should_stop():
+                break
+
             skipped_folders.extend(dirpath / d for d in dirnames if is_ignored_dirname(d))
             dirnames[:] = [d for d in dirnames if not is_ignored_dirname(d)]
 
             for filename in filenames:
+                if should_stop is not None and should_stop():
+                    break
+
                 file_path = dirpath / filename
+                if on_file is not None:
+                    on_file(file_path)
 
                 if not should_scan_file(file_path):
                     skipped_files.append(file_path)
@@ -0,0 +1,228 @@
+"""Rapports lisibles par machine (NDJSON ou CSV).
+
+Les enregistrements sont écrits dès qu'ils sont produits : un groupe de doublons
+n'est jamais conservé en mémoire une fois écrit, ce qui permet de traiter des
+millions de fichiers à mémoire constante. Avec `top_k`, seuls les K groupes qui
+gaspillent le plus d'espace sont gardés dans un tas borné et écrits à la fermeture.
+
+Contenu:
+    - REPORT_FORMATS: formats disponibles.
+    - TopKGroups: sélection des K plus gros groupes via un tas borné.
+    - ReportWriter: base commune (comptage, top-K, résumé final).
+    - NdjsonReportWriter / CsvReportWriter: implémentations par format.
+    - open_report: ouvre un rapport vers un fichier ou la sortie standard.
+"""
+
+import csv
+import heapq
+import itertools
+import json
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, TextIO
+
+from photodedup.domain.models import DuplicateGroup
+
+REPORT_FORMATS = frozenset({"ndjson", "csv"})
+
+CSV_COLUMNS = (
+    "type",
+    "group",
+    "hash",
+    "detection",
+    "path",
+    "size",
+    "modified_at",
+    "wasted_space",
+    "message",
+)
+
+
+class TopKGroups:
+    """Garde les `k` groupes au plus grand espace gaspillé (mémoire O(k))."""
+
+    def __init__(self, k: int) -> None:
+        if k <= 0:
+            raise ValueError("k doit être strictement positif.")
+        self.k = k
+        self._heap: list[tuple[int, int, DuplicateGroup]] = []
+        # Départage stable des égalités : le premier groupe vu l'emporte
+        self._counter = itertools.count()
+
+    def push(self, group: DuplicateGroup) -> None:
+        item = (group.wasted_space, -next(self._counter), group)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def sorted(self) -> list[DuplicateGroup]:
+        """Groupes retenus, du plus gros gaspillage au plus petit."""
+        return [group for _, _, group in sorted(self._heap, key=lambda i: i[:2], reverse=True)]
+
+
+class ReportWriter(ABC):
+    """Base des rédacteurs de rapport.
+
+    Les sous-classes implémentent `_write_group`, `_write_entry` et `_write_summary`.
+    """
+
+    def __init__(self, stream: TextIO, top_k: int | None = None) -> None:
+        self.stream = stream
+        self.top = TopKGroups(top_k) if top_k else None
+        self.groups = 0
+        self.duplicate_files = 0
+        self.wasted_space = 0
+        self.errors = 0
+        self.skipped = 0
+
+    def write_group(self, group: DuplicateGroup) -> None:
+        self.groups += 1
+        self.duplicate_files += group.extra_files
+        self.wasted_space += group.wasted_space
+        if self.top is not None:
+            self.top.push(group)
+        else:
+            self._write_group(self.groups, group)
+
+    def write_groups(self, groups: Iterable[DuplicateGroup]) -> None:
+        for group in groups:
+            self.write_group(group)
+
+    def write_error(self, message: str) -> None:
+        self.errors += 1
+        self._write_entry("error", message=message)
+
+    def write_skipped_folder(self, path: Path) -> None:
+        self.skipped += 1
+        self._write_entry("skipped_folder", path=str(path))
+
+    def write_skipped_file(self, path: Path) -> None:
+        self.skipped += 1
+        self._write_entry("skipped_file", path=str(path))
+
+    def close(self) -> None:
+        """Écrit les groupes du top-K éventuel puis le résumé, et vide le flux."""
+        if self.top is not None:
+            for rank, group in enumerate(self.top.sorted(), start=1):
+                self._write_group(rank, group)
+        self._write_summary()
+        self.stream.flush()
+
+    @abstractmethod
+    def _write_group(self, number: int, group: DuplicateGroup) -> None: ...
+
+    @abstractmethod
+    def _write_entry(self, kind: str, path: str = "", message: str = "") -> None: ...
+
+    @abstractmethod
+    def _write_summary(self) -> None: ...
+
+
+class NdjsonReportWriter(ReportWriter):
+    """Un objet JSON par ligne : un par groupe, erreur ou entrée ignorée, puis un résumé."""
+
+    def _dump(self, record: dict) -> None:
+        self.stream.write(json.dumps(record, ensure_ascii=False))
+        self.stream.write("\n")
+
+    def _write_group(self, number: int, group: DuplicateGroup) -> None:
+        self._dump(
+            {
+                "type": "group",
+                "group": number,
+                "hash": group.hash,
+                "detection": group.detection,
+                "count": len(group.imagefiles),
+                "wasted_space": group.wasted_space,
+                "files": [
+                    {
+                        "path": str(img.path),
+                        "size": img.size,
+                        "modified_at": img.modified_at.isoformat(),
+                    }
+                    for img in group.imagefiles
+                ],
+            }
+        )
+
+    def _write_entry(self, kind: str, path: str = "", message: str = "") -> None:
+        record = {"type": kind}
+        if path:
+            record["path"] = path
+        if message:
+            record["message"] = message
+        self._dump(record)
+
+    def _write_summary(self) -> None:
+        self._dump(
+            {
+                "type": "summary",
+                "groups": self.groups,
+                "duplicate_files": self.duplicate_files,
+                "wasted_space": self.wasted_space,
+                "errors": self.errors,
+                "skipped": self.skipped,
+            }
+        )
+
+
+class CsvReportWriter(ReportWriter):
+    """Une ligne par fichier de groupe, erreur ou entrée ignorée (colonnes `CSV_COLUMNS`).
+
+    Le résumé n'est pas écrit : un CSV doit garder un schéma unique.
+    """
+
+    def __init__(self, stream: TextIO, top_k: int | None = None) -> None:
+        super().__init__(stream, top_k)
+        self._csv = csv.DictWriter(stream, fieldnames=CSV_COLUMNS, lineterminator="\n")
+        self._csv.writeheader()
+
+    def _write_group(self, number: int, group: DuplicateGroup) -> None:
+        for img in group.imagefiles:
+            self._csv.writerow(
+                {
+                    "type": "group",
+                    "group": number,
+                    "hash": group.hash,
+                    "detection": group.detection,
+                    "path": str(img.path),
+                    "size": img.size,
+                    "modified_at": img.modified_at.isoformat(),
+                    "wasted_space": group.wasted_space,
+                }
+            )
+
+    def _write_entry(self, kind: str, path: str = "", message: str = "") -> None:
+        self._csv.writerow({"type": kind, "path": path, "message": message})
+
+    def _write_summary(self) -> None:
+        # Pas de ligne de résumé : elle casserait le schéma unique du CSV
+        return None
+
+
+@contextmanager
+def open_report(
+    fmt: str, destination: Path | None = None, top_k: int | None = None
+) -> Iterator[ReportWriter]:
+    """Ouvre un rapport `fmt` vers `destination` (sortie standard si None ou '-')."""
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Format de rapport inconnu : {fmt}")
+    writer_class = NdjsonReportWriter if fmt == "ndjson" else CsvReportWriter
+
+    if destination is None or str(destination) == "-":
+        writer = writer_class(sys.stdout, top_k)
+        yield writer
+        writer.close()
+        return
+
+    with open(destination, "w", encoding="utf-8", newline="") as stream:
+        writer = writer_class(stream, top_k)
+        yield writer
+        writer.close()
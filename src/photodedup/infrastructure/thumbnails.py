@@ -0,0 +1,286 @@
+"""Cache de miniatures adressé par contenu.
+
+Les miniatures sont indexées par l'empreinte du contenu (ex: `DuplicateGroup.hash`) :
+tous les fichiers d'un groupe de doublons partagent donc une seule entrée.
+
+Deux niveaux :
+    - disque : `cache_dir/ab/cd/<empreinte>-<taille>.jpg`, borné en octets, les
+      entrées les moins récemment utilisées sont évincées en premier ;
+    - mémoire : LRU borné en octets, devant le disque, pour un défilement fluide.
+
+Les miniatures manquantes sont générées dans un pool de processus. Pour les JPEG,
+`Image.draft` fait décoder l'image directement à 1/2, 1/4 ou 1/8 de sa taille,
+ce qui évite de décoder des photos de plusieurs dizaines de mégapixels en entier.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+DEFAULT_THUMBNAIL_SIZE = 256
+DEFAULT_MAX_DISK_BYTES = 512 * 1024**2
+DEFAULT_MAX_MEMORY_BYTES = 64 * 1024**2
+
+# Après une éviction, le cache disque redescend à cette fraction de sa limite
+EVICTION_LOW_WATERMARK = 0.9
+
+THUMBNAIL_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+
+# `fork` depuis un processus multithread (interface Qt, pool de scan) peut bloquer
+# les enfants sur un verrou copié dans un état incohérent
+POOL_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def render_thumbnail(source: Path, destination: Path, size: int) -> int:
+    """Écrit la miniature JPEG de `source` dans `destination` et renvoie sa taille.
+
+    Exécutée dans un processus du pool : elle ne dépend d'aucun état partagé.
+    """
+    with Image.open(source) as img:
+        img.draft("RGB", (size, size))
+        thumb = ImageOps.exif_transpose(img)
+        thumb.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        if thumb.mode not in ("RGB", "L"):
+            thumb = thumb.convert("RGB")
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        tmp = destination.with_name(f"{destination.name}.{os.getpid()}.tmp")
+        thumb.save(tmp, "JPEG", quality=85)
+    os.replace(tmp, destination)
+    return destination.stat().st_size
+
+
+class MemoryLRU:
+    """Dictionnaire LRU borné par la taille totale des valeurs en octets."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.total = 0
+        self._items: OrderedDict[str, bytes] = OrderedDict()
+
+    def get(self, key: str) -> bytes | None:
+        data = self._items.get(key)
+        if data is not None:
+            self._items.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.total -= len(old)
+        self._items[key] = data
+        self.total += len(data)
+        while self.total > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.total -= len(evicted)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class ThumbnailCache:
+    """Miniatures JPEG par empreinte de contenu, sur disque et en mémoire.
+
+    Args:
+        cache_dir: Dossier du cache disque.
+        size: Côté maximal des miniatures en pixels.
+        max_disk_bytes: Taille maximale du cache disque.
+        max_memory_bytes: Taille maximale du cache mémoire.
+        workers: Processus de génération (None : nombre de CPU, 0 : dans le thread appelant).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        size: int = DEFAULT_THUMBNAIL_SIZE,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        workers: int | None = None,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.size = size
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = MemoryLRU(max_memory_bytes)
+        self.workers = workers
+        self._pool: ProcessPoolExecutor | None = None
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.RLock()
+        # clé -> (octets, dernier accès) pour toutes les miniatures sur disque
+        self._index: dict[str, tuple[int, float]] = {}
+        # Clés servies depuis la mémoire : leur date d'accès est écrite à la fermeture
+        self._touched: set[str] = set()
+        self.disk_bytes = 0
+        self._load_index()
+
+    def __enter__(self) -> "ThumbnailCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        with self._lock:
+            touched = [(key, self._index[key][1]) for key in self._touched if key in self._index]
+            self._touched.clear()
+        for key, last_used in touched:
+            self._touch(self._path_for_key(key), last_used)
+
+    def key(self, digest: str) -> str:
+        return f"{digest}-{self.size}"
+
+    def path_for(self, digest: str) -> Path:
+        """Emplacement sur disque, réparti sur deux niveaux de sous-dossiers."""
+        return self._path_for_key(self.key(digest))
+
+    def _path_for_key(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key[2:4] / f"{key}.jpg"
+
+    def _load_index(self) -> None:
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.glob("*/*/*.jpg"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            self._index[path.stem] = (st.st_size, st.st_mtime)
+            self.disk_bytes += st.st_size
+
+    def get(self, digest: str, source: Path) -> bytes | None:
+        """Miniature de `source` (JPEG encodé), générée au besoin ; None si illisible."""
+        key = self.key(digest)
+        with self._lock:
+            data = self.memory.get(key)
+            if data is not None and key in self._index:
+                # Une miniature très consultée ne doit pas être évincée du disque
+                self._index[key] = (self._index[key][0], time.time())
+                self._touched.add(key)
+        if data is not None:
+            return data
+
+        data = self._read_disk(digest)
+        if data is None:
+            try:
+                self.prefetch([(digest, source)])[0].result()
+            except THUMBNAIL_ERRORS:
+                return None
+            data = self._read_disk(digest)
+        return data
+
+    def prefetch(self, items: Iterable[tuple[str, Path]]) -> list[Future]:
+        """Lance la génération des miniatures absentes du disque, sans attendre.
+
+        Une même empreinte n'est générée qu'une fois, même si elle apparaît
+        plusieurs fois ou est déjà en cours de génération.
+        """
+        futures, inline = [], []
+        with self._lock:
+            for digest, source in items:
+                key = self.key(digest)
+                future = self._pending.get(key)
+                if future is None:
+                    if key in self._index:
+                        future = Future()
+                        future.set_result(self._index[key][0])
+                    else:
+                        future = self._submit(key, digest, source)
+                        if self.workers == 0:
+                            inline.append((future, digest, source))
+                futures.append(future)
+
+        # Sans pool, le rendu se fait hors du verrou pour ne pas bloquer les autres threads
+        for future, digest, source in inline:
+            try:
+                future.set_result(render_thumbnail(source, self.path_for(digest), self.size))
+            except Exception as e:
+                # Toute erreur passe par le Future, sinon la clé resterait « en cours »
+                future.set_exception(e)
+        return futures
+
+    def _submit(self, key: str, digest: str, source: Path) -> Future:
+        """Réserve la génération de `key` (sans pool, l'appelant complète le Future)."""
+        if self.workers == 0:
+            future = Future()
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(POOL_START_METHOD),
+                )
+            future = self._pool.submit(render_thumbnail, source, self.path_for(digest), self.size)
+        self._pending[key] = future
+        future.add_done_callback(lambda f: self._on_rendered(key, f))
+        return future
+
+    def _on_rendered(self, key: str, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            size = future.result()
+            previous = self._index.get(key)
+            if previous is not None:
+                self.disk_bytes -= previous[0]
+            self._index[key] = (size, time.time())
+            self.disk_bytes += size
+            self._evict()
+
+    def _read_disk(self, digest: str) -> bytes | None:
+        key = self.key(digest)
+        path = self.path_for(digest)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                entry = self._index.pop(key, None)
+                if entry is not None:
+                    self.disk_bytes -= entry[0]
+            return None
+        except OSError:
+            # Illisible mais toujours présent : l'entrée reste comptée sur le disque
+            return None
+        now = time.time()
+        with self._lock:
+            self.memory.put(key, data)
+            if key in self._index:
+                self._index[key] = (self._index[key][0], now)
+            self._touched.discard(key)
+        self._touch(path, now)
+        return data
+
+    @staticmethod
+    def _touch(path: Path, last_used: float) -> None:
+        try:
+            # La date de modification sert de date de dernier accès entre deux sessions
+            os.utime(path, (last_used, last_used))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        if self.disk_bytes <= self.max_disk_bytes:
+            return
+        target = self.max_disk_bytes * EVICTION_LOW_WATERMARK
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self.disk_bytes <= target:
+                break
+            self._path_for_key(key).unlink(missing_ok=True)
+            del self._index[key]
+            self._touched.discard(key)
+            self.disk_bytes -= size
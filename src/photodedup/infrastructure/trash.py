@@ -0,0 +1,463 @@
+"""Envoi à la corbeille (spécification freedesktop.org) et suppression définitive.
+
+Les fichiers ne sont jamais copiés : chacun est renommé dans la corbeille de son
+propre périphérique (corbeille personnelle si c'est celui du dossier personnel,
+sinon `$topdir/.Trash/$uid` ou `$topdir/.Trash-$uid`). Les fichiers sont traités
+par lots, avec un worker par périphérique ; les `.trashinfo` d'un lot sont
+réservés puis leur dossier est synchronisé sur disque en une seule fois.
+
+Juste avant chaque opération, la taille et la date de modification sont comparées
+à celles relevées au scan : un fichier modifié depuis n'est pas touché.
+
+Chaque opération est d'abord inscrite dans un journal en ajout seul (JSON Lines),
+ce qui permet d'annuler un lot entier, même après un arrêt brutal.
+
+Contenu:
+    - RemovalRequest / RemovalOutcome: entrée et résultat d'une opération.
+    - TrashLocation / find_trash: corbeille à utiliser pour un fichier.
+    - RemovalJournal: journal des opérations.
+    - RemovalExecutor: exécution par lots, en parallèle, et annulation.
+"""
+
+import errno
+import json
+import os
+import stat
+import threading
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+from photodedup.domain.models import ImageFile
+
+REMOVAL_MODES = frozenset({"trash", "delete"})
+
+DEFAULT_BATCH_SIZE = 256
+
+
+@dataclass(frozen=True)
+class RemovalRequest:
+    """Fichier à retirer, avec l'état relevé lors du scan."""
+
+    path: Path
+    size: int
+    modified_at: datetime
+
+    @classmethod
+    def from_image(cls, image: ImageFile) -> "RemovalRequest":
+        return cls(path=image.path, size=image.size, modified_at=image.modified_at)
+
+
+@dataclass
+class RemovalOutcome:
+    """Résultat d'une opération.
+
+    Attributes:
+        path: Chemin d'origine.
+        status: 'trashed', 'deleted', 'restored', 'changed', 'missing', 'conflict' ou 'error'.
+        trashed_path: Emplacement dans la corbeille (None si le fichier n'y est pas).
+        message: Détail en cas d'échec.
+    """
+
+    path: Path
+    status: str
+    trashed_path: Path | None = None
+    message: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("trashed", "deleted", "restored")
+
+
+@dataclass(frozen=True)
+class TrashLocation:
+    """Une corbeille : `files/` et `info/` sous `root`.
+
+    `topdir` est le point de montage pour les corbeilles de périphérique (chemins
+    relatifs dans les `.trashinfo`), None pour la corbeille personnelle.
+    """
+
+    root: Path
+    topdir: Path | None = None
+
+    @property
+    def files_dir(self) -> Path:
+        return self.root / "files"
+
+    @property
+    def info_dir(self) -> Path:
+        return self.root / "info"
+
+    def ensure(self) -> None:
+        """Crée la corbeille (droits 0700) et vérifie qu'elle appartient à l'utilisateur.
+
+        Raises:
+            PermissionError: si `root`, `files/` ou `info/` est un lien, n'est pas un
+                dossier ou appartient à un autre utilisateur.
+        """
+        self.root.parent.mkdir(parents=True, exist_ok=True)
+        for directory in (self.root, self.files_dir, self.info_dir):
+            try:
+                # `mkdir(parents=True)` n'appliquerait le mode qu'au dernier niveau
+                directory.mkdir(mode=0o700)
+            except FileExistsError:
+                pass
+            check_owned_dir(directory)
+
+    def info_path(self, path: Path) -> str:
+        """Valeur de la clé `Path=` du `.trashinfo` (encodée comme une URL)."""
+        path = path.parent.resolve() / path.name
+        if self.topdir is not None and path.is_relative_to(self.topdir):
+            return quote(str(path.relative_to(self.topdir)))
+        return quote(str(path))
+
+
+def check_owned_dir(path: Path) -> None:
+    """Refuse `path` s'il n'est pas un vrai dossier appartenant à l'utilisateur courant."""
+    st = path.lstat()
+    if stat.S_ISLNK(st.st_mode) or not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(errno.EPERM, "Pas un dossier (ou lien symbolique)", str(path))
+    if st.st_uid != os.getuid():
+        raise PermissionError(errno.EPERM, "Dossier d'un autre utilisateur", str(path))
+
+
+def home_trash_dir() -> Path:
+    data_home = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "Trash"
+
+
+def find_mount_point(path: Path) -> Path:
+    """Remonte l'arborescence tant que l'on reste sur le même périphérique."""
+    path = path.resolve()
+    dev = path.lstat().st_dev
+    while path.parent != path and path.parent.lstat().st_dev == dev:
+        path = path.parent
+    return path
+
+
+def existing_ancestor(path: Path) -> Path:
+    while not path.exists() and path.parent != path:
+        path = path.parent
+    return path
+
+
+def find_trash(path: Path, home_trash: Path) -> TrashLocation:
+    """Choisit la corbeille de `path` selon la spécification freedesktop.org."""
+    if path.lstat().st_dev == existing_ancestor(home_trash).stat().st_dev:
+        return TrashLocation(home_trash)
+
+    topdir = find_mount_point(path.parent)
+    uid = os.getuid()
+    admin_trash = topdir / ".Trash"
+    try:
+        st = admin_trash.lstat()
+    except FileNotFoundError:
+        pass
+    else:
+        # La spécification impose un vrai dossier (pas un lien) avec le sticky bit
+        if stat.S_ISDIR(st.st_mode) and st.st_mode & stat.S_ISVTX:
+            return TrashLocation(admin_trash / str(uid), topdir)
+    return TrashLocation(topdir / f".Trash-{uid}", topdir)
+
+
+class RemovalJournal:
+    """Journal en ajout seul des opérations (une entrée JSON par ligne)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, records: list[dict]) -> None:
+        if not records:
+            return
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def read(self) -> list[dict]:
+        if not self.path.exists():
+            return []
+        with open(self.path, encoding="utf-8") as f:
+            # Une dernière ligne tronquée (arrêt brutal) est ignorée
+            records = []
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+            return records
+
+    def last_batch(self) -> str | None:
+        for record in reversed(self.read()):
+            if record["op"] == "trash":
+                return record["batch"]
+        return None
+
+
+def is_unchanged(request: RemovalRequest) -> bool | None:
+    """True si le fichier est tel qu'au scan, False s'il a changé, None s'il a disparu."""
+    try:
+        st = request.path.lstat()
+    except FileNotFoundError:
+        return None
+    return (
+        stat.S_ISREG(st.st_mode)
+        and st.st_size == request.size
+        and datetime.fromtimestamp(st.st_mtime) == request.modified_at
+    )
+
+
+def fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def reserve_trash_name(location: TrashLocation, path: Path, deleted_at: str) -> Path:
+    """Crée le `.trashinfo` de façon exclusive et renvoie la destination dans `files/`."""
+    content = f"[Trash Info]\nPath={location.info_path(path)}\nDeletionDate={deleted_at}\n"
+    stem, suffix = path.stem, path.suffix
+    name, n = path.name, 1
+    while True:
+        info = location.info_dir / f"{name}.trashinfo"
+        try:
+            fd = os.open(info, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            if not (location.files_dir / name).exists():
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(content)
+                return location.files_dir / name
+            os.close(fd)
+            info.unlink()
+        n += 1
+        name = f"{stem}.{n}{suffix}"
+
+
+def info_file_for(trashed_path: Path) -> Path:
+    return trashed_path.parent.parent / "info" / f"{trashed_path.name}.trashinfo"
+
+
+class RemovalExecutor:
+    """Retire des fichiers par lots, un worker par périphérique, avec journal.
+
+    Args:
+        journal_path: Fichier du journal (créé au besoin).
+        mode: 'trash' (par défaut) ou 'delete' (définitif, non annulable).
+        batch_size: Nombre de fichiers par lot.
+        max_workers: Nombre maximal de périphériques traités en parallèle.
+        home_trash: Corbeille personnelle (`$XDG_DATA_HOME/Trash` par défaut).
+    """
+
+    def __init__(
+        self,
+        journal_path: Path,
+        mode: str = "trash",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int | None = None,
+        home_trash: Path | None = None,
+    ) -> None:
+        if mode not in REMOVAL_MODES:
+            raise ValueError(f"Mode de suppression inconnu : {mode}")
+        if batch_size <= 0:
+            raise ValueError("batch_size doit être strictement positif.")
+        self.journal = RemovalJournal(journal_path)
+        self.mode = mode
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.home_trash = home_trash or home_trash_dir()
+
+    def remove(self, requests: list[RemovalRequest]) -> tuple[str, list[RemovalOutcome]]:
+        """Retire les fichiers et renvoie l'identifiant du lot (pour `undo`) et les résultats."""
+        batch_id = uuid.uuid4().hex
+        outcomes: list[RemovalOutcome] = []
+        by_device: dict[int, list[RemovalRequest]] = defaultdict(list)
+
+        for request in requests:
+            try:
+                by_device[request.path.lstat().st_dev].append(request)
+            except FileNotFoundError:
+                outcomes.append(RemovalOutcome(request.path, "missing"))
+            except OSError as e:
+                outcomes.append(RemovalOutcome(request.path, "error", message=str(e)))
+
+        if not by_device:
+            return batch_id, outcomes
+
+        workers = min(len(by_device), self.max_workers or len(by_device))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self._remove_device, batch_id, device_requests)
+                for device_requests in by_device.values()
+            ]
+            for future in futures:
+                outcomes.extend(future.result())
+        return batch_id, outcomes
+
+    def _remove_device(self, batch_id: str, requests: list[RemovalRequest]) -> list[RemovalOutcome]:
+        outcomes = []
+        location = None
+        if self.mode == "trash":
+            location = find_trash(requests[0].path, self.home_trash)
+            try:
+                location.ensure()
+            except OSError as e:
+                message = f"Corbeille indisponible ({location.root}) : {e.strerror or e}"
+                return [RemovalOutcome(r.path, "error", message=message) for r in requests]
+
+        for start in range(0, len(requests), self.batch_size):
+            batch = requests[start : start + self.batch_size]
+            if location is None:
+                outcomes.extend(self._delete_batch(batch_id, batch))
+            else:
+                outcomes.extend(self._trash_batch(batch_id, location, batch))
+        return outcomes
+
+    def _trash_batch(
+        self, batch_id: str, location: TrashLocation, requests: list[RemovalRequest]
+    ) -> list[RemovalOutcome]:
+        outcomes, planned = [], []
+        deleted_at = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+
+        for request in requests:
+            state = is_unchanged(request)
+            if state is None:
+                outcomes.append(RemovalOutcome(request.path, "missing"))
+            elif not state:
+                outcomes.append(RemovalOutcome(request.path, "changed"))
+            else:
+                try:
+                    target = reserve_trash_name(location, request.path, deleted_at)
+                except OSError as e:
+                    outcomes.append(RemovalOutcome(request.path, "error", message=str(e)))
+                else:
+                    planned.append((request, target))
+
+        if not planned:
+            return outcomes
+
+        # Les entrées des .trashinfo et le journal sont sur disque avant le moindre
+        # déplacement. Le contenu des .trashinfo n'est pas synchronisé un par un (ce
+        # serait un fsync par fichier) : après un arrêt brutal, c'est le journal qui
+        # fait foi pour `undo`.
+        fsync_dir(location.info_dir)
+        self.journal.append(
+            [
+                {
+                    "op": "trash",
+                    "batch": batch_id,
+                    "original": str(request.path),
+                    "trashed": str(target),
+                    "size": request.size,
+                    "mtime": request.modified_at.isoformat(),
+                }
+                for request, target in planned
+            ]
+        )
+
+        aborted = []
+        for request, target in planned:
+            # Nouvelle vérification juste avant le déplacement : la réservation et
+            # le journal ont pu prendre du temps
+            state = is_unchanged(request)
+            if state:
+                try:
+                    os.rename(request.path, target)
+                except OSError as e:
+                    outcome = RemovalOutcome(request.path, "error", message=str(e))
+                else:
+                    outcome = RemovalOutcome(request.path, "trashed", target)
+            else:
+                status = "missing" if state is None else "changed"
+                outcome = RemovalOutcome(request.path, status)
+
+            outcomes.append(outcome)
+            if outcome.status != "trashed":
+                # Le nom libéré peut être repris par un lot ultérieur : l'entrée
+                # du journal est close pour qu'`undo` ne restaure pas ce fichier-là
+                info_file_for(target).unlink(missing_ok=True)
+                aborted.append({"op": "abort", "batch": batch_id, "trashed": str(target)})
+        fsync_dir(location.files_dir)
+        self.journal.append(aborted)
+        return outcomes
+
+    def _delete_batch(self, batch_id: str, requests: list[RemovalRequest]) -> list[RemovalOutcome]:
+        outcomes, records = [], []
+        for request in requests:
+            state = is_unchanged(request)
+            if state is None:
+                outcomes.append(RemovalOutcome(request.path, "missing"))
+                continue
+            if not state:
+                outcomes.append(RemovalOutcome(request.path, "changed"))
+                continue
+            try:
+                request.path.unlink()
+            except OSError as e:
+                outcomes.append(RemovalOutcome(request.path, "error", message=str(e)))
+            else:
+                outcomes.append(RemovalOutcome(request.path, "deleted"))
+                records.append({"op": "delete", "batch": batch_id, "original": str(request.path)})
+        self.journal.append(records)
+        return outcomes
+
+    def undo(self, batch_id: str | None = None) -> list[RemovalOutcome]:
+        """Restaure les fichiers envoyés à la corbeille par un lot (le dernier par défaut).
+
+        Un fichier de la corbeille dont la taille ou la date ne correspond plus au
+        journal n'est pas restauré (statut 'conflict').
+        """
+        batch_id = batch_id or self.journal.last_batch()
+        if batch_id is None:
+            return []
+
+        records = self.journal.read()
+        # Un même nom peut être réutilisé dans la corbeille par un lot ultérieur
+        closed = {(r["batch"], r["trashed"]) for r in records if r["op"] in ("restore", "abort")}
+        outcomes, journal_records = [], []
+        for record in records:
+            if record["batch"] != batch_id or record["op"] != "trash":
+                continue
+            if (batch_id, record["trashed"]) in closed:
+                continue
+            original, trashed = Path(record["original"]), Path(record["trashed"])
+            # Le fichier de la corbeille doit être celui que ce lot y a déplacé
+            state = is_unchanged(
+                RemovalRequest(trashed, record["size"], datetime.fromisoformat(record["mtime"]))
+            )
+            if state is None:
+                outcomes.append(RemovalOutcome(original, "missing"))
+                continue
+            if not state or original.exists():
+                outcomes.append(RemovalOutcome(original, "conflict", trashed))
+                continue
+            try:
+                original.parent.mkdir(parents=True, exist_ok=True)
+                os.rename(trashed, original)
+            except OSError as e:
+                outcomes.append(RemovalOutcome(original, "error", trashed, str(e)))
+                continue
+            info_file_for(trashed).unlink(missing_ok=True)
+            outcomes.append(RemovalOutcome(original, "restored"))
+            journal_records.append(
+                {
+                    "op": "restore",
+                    "batch": batch_id,
+                    "original": str(original),
+                    "trashed": str(trashed),
+                }
+            )
+
+        self.journal.append(journal_records)
+        return outcomes
@@ -0,0 +1,506 @@
+"""Recherche de plus proches voisins sur CPU, en NumPy pur.
+
+Deux index, à l'interface calquée sur FAISS (`train`, `add`, `search` renvoyant
+`(distances, ids)` avec -1 pour les résultats manquants) pour pouvoir le
+remplacer plus tard sans toucher aux appelants :
+
+    - FlatIndex: recherche exacte par blocs de produits matriciels.
+    - IVFIndex: quantificateur grossier (k-means) ; seules les `nprobe` listes
+      les plus proches de la requête sont parcourues. Avec `m > 0`, les vecteurs
+      sont compressés par quantification produit (PQ) et les distances sont
+      approchées par tables (ADC).
+
+Les vecteurs, identifiants et codes sont stockés dans des fichiers projetés en
+mémoire (`np.memmap`) lorsque `path` est fourni : l'index peut dépasser la RAM
+et se rouvre avec `open_index(path)`.
+
+Métriques : 'l2' (distance euclidienne au carré, croissante) et 'ip' (produit
+scalaire, décroissant ; sur des vecteurs normalisés, c'est le cosinus).
+"""
+
+import json
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+METRICS = frozenset({"l2", "ip"})
+
+DEFAULT_BLOCK_SIZE = 16384
+KMEANS_ITERATIONS = 20
+# Comme FAISS : au-delà de 256 points par centroïde, l'entraînement n'apprend plus rien
+KMEANS_MAX_POINTS_PER_CENTROID = 256
+
+
+class VectorIndex(Protocol):
+    d: int
+    metric: str
+
+    @property
+    def ntotal(self) -> int: ...
+
+    @property
+    def is_trained(self) -> bool: ...
+
+    def train(self, x: np.ndarray) -> None: ...
+
+    def add(self, x: np.ndarray, ids: np.ndarray | None = None) -> None: ...
+
+    def search(self, x: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]: ...
+
+
+class GrowableArray:
+    """Tableau extensible par ajout de lignes, en mémoire ou projeté depuis `path`."""
+
+    def __init__(self, row_shape: tuple, dtype, path: Path | None = None) -> None:
+        self.row_shape = row_shape
+        self.dtype = np.dtype(dtype)
+        self.path = path
+        self.count = 0
+        self._data = np.empty((0, *row_shape), self.dtype)
+        if path is not None and path.exists():
+            row_bytes = self.dtype.itemsize * int(np.prod(row_shape, dtype=np.int64))
+            self.count = path.stat().st_size // row_bytes
+            self._open()
+
+    def _open(self) -> None:
+        if self.count:
+            self._data = np.memmap(
+                self.path, self.dtype, mode="r", shape=(self.count, *self.row_shape)
+            )
+
+    def append(self, rows: np.ndarray) -> None:
+        rows = np.ascontiguousarray(rows, dtype=self.dtype).reshape(-1, *self.row_shape)
+        if self.path is not None:
+            # Ajout en fin de fichier puis nouvelle projection : rien n'est recopié
+            with open(self.path, "ab") as f:
+                f.write(rows.tobytes())
+            self.count += len(rows)
+            self._open()
+            return
+
+        needed = self.count + len(rows)
+        if needed > len(self._data):
+            grown = np.empty((max(needed, 2 * len(self._data)), *self.row_shape), self.dtype)
+            grown[: self.count] = self._data[: self.count]
+            self._data = grown
+        self._data[self.count : needed] = rows
+        self.count = needed
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data[: self.count]
+
+
+def as_matrix(x: np.ndarray, d: int) -> np.ndarray:
+    x = np.ascontiguousarray(x, dtype=np.float32)
+    if x.ndim == 1:
+        x = x[None, :]
+    if x.ndim != 2 or x.shape[1] != d:
+        raise ValueError(f"Vecteurs de dimension {d} attendus, reçu {x.shape}.")
+    return x
+
+
+def check_k(k: int) -> None:
+    if k <= 0:
+        raise ValueError("k doit être strictement positif.")
+
+
+def pairwise_distances(
+    queries: np.ndarray, vectors: np.ndarray, metric: str, norms: np.ndarray | None = None
+) -> np.ndarray:
+    """Distances (nq, n) à minimiser : L2 au carré, ou opposé du produit scalaire."""
+    products = queries @ vectors.T
+    if metric == "ip":
+        return -products
+    if norms is None:
+        norms = np.einsum("ij,ij->i", vectors, vectors)
+    q_norms = np.einsum("ij,ij->i", queries, queries)
+    distances = q_norms[:, None] - 2 * products + norms[None, :]
+    return np.maximum(distances, 0, out=distances)
+
+
+def merge_top_k(
+    best_d: np.ndarray, best_i: np.ndarray, dist: np.ndarray, ids: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fusionne un bloc de distances (nq, b) dans le top-k courant (non trié)."""
+    all_d = np.concatenate([best_d, dist], axis=1)
+    all_i = np.concatenate([best_i, np.broadcast_to(ids, dist.shape)], axis=1)
+    if all_d.shape[1] > k:
+        keep = np.argpartition(all_d, k - 1, axis=1)[:, :k]
+        all_d = np.take_along_axis(all_d, keep, axis=1)
+        all_i = np.take_along_axis(all_i, keep, axis=1)
+    return all_d, all_i
+
+
+def finalize_top_k(
+    best_d: np.ndarray, best_i: np.ndarray, k: int, metric: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """Trie le top-k, complète avec (inf, -1) et remet le signe des produits scalaires."""
+    nq = len(best_d)
+    distances = np.full((nq, k), np.inf, dtype=np.float32)
+    labels = np.full((nq, k), -1, dtype=np.int64)
+    order = np.argsort(best_d, axis=1, kind="stable")
+    n = min(k, best_d.shape[1])
+    distances[:, :n] = np.take_along_axis(best_d, order, axis=1)[:, :n]
+    labels[:, :n] = np.take_along_axis(best_i, order, axis=1)[:, :n]
+    labels[np.isinf(distances)] = -1
+    if metric == "ip":
+        distances = -distances
+    return distances, labels
+
+
+def blocked_search(
+    queries: np.ndarray,
+    vectors: np.ndarray,
+    ids: np.ndarray,
+    k: int,
+    metric: str,
+    norms: np.ndarray | None = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Top-k exact de `queries` parmi `vectors`, bloc par bloc (mémoire O(nq × bloc))."""
+    best_d = np.empty((len(queries), 0), dtype=np.float32)
+    best_i = np.empty((len(queries), 0), dtype=np.int64)
+    for start in range(0, len(vectors), block_size):
+        block = np.asarray(vectors[start : start + block_size], dtype=np.float32)
+        block_norms = None if norms is None else np.asarray(norms[start : start + block_size])
+        dist = pairwise_distances(queries, block, metric, block_norms)
+        best_d, best_i = merge_top_k(best_d, best_i, dist, ids[start : start + len(block)], k)
+    return finalize_top_k(best_d, best_i, k, metric)
+
+
+def nearest_centroid(x: np.ndarray, centroids: np.ndarray, block_size: int) -> np.ndarray:
+    labels = np.empty(len(x), dtype=np.int64)
+    norms = np.einsum("ij,ij->i", centroids, centroids)
+    for start in range(0, len(x), block_size):
+        # ||x||² est constant par ligne : inutile pour l'argmin
+        scores = x[start : start + block_size] @ centroids.T
+        scores *= -2
+        scores += norms
+        labels[start : start + len(scores)] = scores.argmin(axis=1)
+    return labels
+
+
+def kmeans(
+    x: np.ndarray,
+    k: int,
+    iterations: int = KMEANS_ITERATIONS,
+    seed: int = 0,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> np.ndarray:
+    """K-means de Lloyd (L2), échantillonné comme dans FAISS ; renvoie les centroïdes."""
+    if len(x) < k:
+        raise ValueError(f"Il faut au moins {k} vecteurs d'entraînement, reçu {len(x)}.")
+    rng = np.random.default_rng(seed)
+    max_points = k * KMEANS_MAX_POINTS_PER_CENTROID
+    if len(x) > max_points:
+        x = x[rng.choice(len(x), max_points, replace=False)]
+    x = np.asarray(x, dtype=np.float32)
+
+    centroids = x[rng.choice(len(x), k, replace=False)].copy()
+    for _ in range(iterations):
+        labels = nearest_centroid(x, centroids, block_size)
+        counts = np.bincount(labels, minlength=k)
+        # Une somme pondérée par colonne : bien plus rapide que np.add.at
+        sums = np.stack(
+            [np.bincount(labels, weights=x[:, j], minlength=k) for j in range(x.shape[1])],
+            axis=1,
+        ).astype(np.float32)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        # Un centroïde vide repart d'un point tiré au hasard
+        if empty.any():
+            centroids[empty] = x[rng.choice(len(x), int(empty.sum()), replace=False)]
+    return centroids
+
+
+class FlatIndex:
+    """Recherche exacte (force brute par blocs)."""
+
+    kind = "flat"
+
+    def __init__(
+        self,
+        d: int,
+        metric: str = "l2",
+        path: Path | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"Métrique inconnue : {metric}")
+        self.d = d
+        self.metric = metric
+        self.path = path
+        self.block_size = block_size
+        if path is not None:
+            prepare_storage(path, {"kind": self.kind, "d": d, "metric": metric})
+        self.vectors = GrowableArray((d,), np.float32, path and path / "vectors.f32")
+        self.norms = GrowableArray((), np.float32, path and path / "norms.f32")
+        self.ids = GrowableArray((), np.int64, path and path / "ids.i64")
+
+    @property
+    def ntotal(self) -> int:
+        return self.vectors.count
+
+    @property
+    def is_trained(self) -> bool:
+        return True
+
+    def train(self, x: np.ndarray) -> None:
+        pass
+
+    def add(self, x: np.ndarray, ids: np.ndarray | None = None) -> None:
+        x = as_matrix(x, self.d)
+        self.ids.append(default_ids(ids, self.ntotal, len(x)))
+        self.norms.append(np.einsum("ij,ij->i", x, x))
+        self.vectors.append(x)
+
+    def search(self, x: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        check_k(k)
+        queries = as_matrix(x, self.d)
+        return blocked_search(
+            queries,
+            self.vectors.data,
+            self.ids.data,
+            k,
+            self.metric,
+            self.norms.data if self.metric == "l2" else None,
+            self.block_size,
+        )
+
+
+class IVFIndex:
+    """Index à listes inversées, avec quantification produit optionnelle.
+
+    Args:
+        d: Dimension des vecteurs.
+        nlist: Nombre de listes (centroïdes du quantificateur grossier).
+        nprobe: Nombre de listes parcourues par requête (précision / vitesse).
+        m: Nombre de sous-quantificateurs PQ (0 : vecteurs stockés tels quels).
+        nbits: Bits par code PQ (au plus 8).
+        metric: 'l2' ou 'ip' ('ip' n'est pas disponible avec la PQ).
+        path: Dossier de stockage (None : en mémoire).
+    """
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        d: int,
+        nlist: int = 1024,
+        nprobe: int = 8,
+        m: int = 0,
+        nbits: int = 8,
+        metric: str = "l2",
+        path: Path | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"Métrique inconnue : {metric}")
+        if m and d % m:
+            raise ValueError(f"La dimension {d} doit être divisible par m={m}.")
+        if m and metric != "l2":
+            raise ValueError("La quantification produit n'est disponible qu'en 'l2'.")
+        if not 1 <= nbits <= 8:
+            raise ValueError("nbits doit être compris entre 1 et 8.")
+        self.d = d
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.m = m
+        self.nbits = nbits
+        self.metric = metric
+        self.path = path
+        self.block_size = block_size
+        self.centroids: np.ndarray | None = None
+        self.codebooks: np.ndarray | None = None
+        self._lists: tuple[np.ndarray, np.ndarray] | None = None
+
+        if path is not None:
+            # nprobe est un réglage de recherche : il peut changer d'une ouverture à l'autre
+            prepare_storage(path, self._meta(), runtime=("nprobe",))
+            quantizer = path / "quantizer.npz"
+            if quantizer.exists():
+                with np.load(quantizer) as data:
+                    self.centroids = data["centroids"]
+                    self.codebooks = data["codebooks"] if m else None
+
+        if m:
+            self.payload = GrowableArray((m,), np.uint8, path and path / "codes.u8")
+        else:
+            self.payload = GrowableArray((d,), np.float32, path and path / "vectors.f32")
+        self.assignments = GrowableArray((), np.int32, path and path / "lists.i32")
+        self.ids = GrowableArray((), np.int64, path and path / "ids.i64")
+
+    def _meta(self) -> dict:
+        return {
+            "kind": self.kind,
+            "d": self.d,
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "m": self.m,
+            "nbits": self.nbits,
+            "metric": self.metric,
+        }
+
+    @property
+    def ntotal(self) -> int:
+        return self.ids.count
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, x: np.ndarray) -> None:
+        x = as_matrix(x, self.d)
+        self.centroids = kmeans(x, self.nlist, block_size=self.block_size)
+        if self.m:
+            residuals = x - self.centroids[nearest_centroid(x, self.centroids, self.block_size)]
+            dsub = self.d // self.m
+            self.codebooks = np.stack(
+                [
+                    kmeans(residuals[:, j * dsub : (j + 1) * dsub], 2**self.nbits, seed=j + 1)
+                    for j in range(self.m)
+                ]
+            )
+        if self.path is not None:
+            np.savez(
+                self.path / "quantizer.npz",
+                centroids=self.centroids,
+                codebooks=self.codebooks if self.m else np.empty(0),
+            )
+
+    def _encode(self, residuals: np.ndarray) -> np.ndarray:
+        dsub = self.d // self.m
+        codes = np.empty((len(residuals), self.m), dtype=np.uint8)
+        for j in range(self.m):
+            sub = np.ascontiguousarray(residuals[:, j * dsub : (j + 1) * dsub])
+            codes[:, j] = nearest_centroid(sub, self.codebooks[j], self.block_size)
+        return codes
+
+    def add(self, x: np.ndarray, ids: np.ndarray | None = None) -> None:
+        if not self.is_trained:
+            raise RuntimeError("L'index doit être entraîné avant l'ajout de vecteurs.")
+        x = as_matrix(x, self.d)
+        # Tout est calculé et validé avant d'écrire : les tableaux restent alignés
+        ids = default_ids(ids, self.ntotal, len(x))
+        labels = nearest_centroid(x, self.centroids, self.block_size)
+        payload = self._encode(x - self.centroids[labels]) if self.m else x
+        self.payload.append(payload)
+        self.assignments.append(labels)
+        self.ids.append(ids)
+        self._lists = None
+
+    def _inverted_lists(self) -> tuple[np.ndarray, np.ndarray]:
+        """Lignes triées par liste et bornes de chaque liste (recalculées après un ajout)."""
+        if self._lists is None:
+            assignments = np.asarray(self.assignments.data)
+            order = np.argsort(assignments, kind="stable")
+            offsets = np.zeros(self.nlist + 1, dtype=np.int64)
+            np.cumsum(np.bincount(assignments, minlength=self.nlist), out=offsets[1:])
+            self._lists = (order, offsets)
+        return self._lists
+
+    def search(self, x: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        if not self.is_trained:
+            raise RuntimeError("L'index doit être entraîné avant la recherche.")
+        check_k(k)
+        queries = as_matrix(x, self.d)
+        order, offsets = self._inverted_lists()
+        nprobe = min(self.nprobe, self.nlist)
+        # Même quantificateur (L2) qu'à l'ajout, quelle que soit la métrique
+        coarse = pairwise_distances(queries, self.centroids, "l2")
+        probes = np.argpartition(coarse, nprobe - 1, axis=1)[:, :nprobe]
+
+        distances = np.empty((len(queries), k), dtype=np.float32)
+        labels = np.empty((len(queries), k), dtype=np.int64)
+        for qi, query in enumerate(queries):
+            # Toutes les listes sondées d'une requête sont traitées en un seul calcul
+            segments = [order[offsets[list_no] : offsets[list_no + 1]] for list_no in probes[qi]]
+            rows = np.concatenate(segments)
+            probe_of_row = np.repeat(np.arange(nprobe), [len(seg) for seg in segments])
+            # Lecture des lignes dans l'ordre du fichier
+            file_order = np.argsort(rows, kind="stable")
+            rows, probe_of_row = rows[file_order], probe_of_row[file_order]
+
+            if self.m:
+                dist = self._adc(query, probes[qi], probe_of_row, self.payload.data[rows])
+            else:
+                vectors = np.asarray(self.payload.data[rows], dtype=np.float32)
+                dist = pairwise_distances(query[None, :], vectors, self.metric)
+            best_d, best_i = merge_top_k(
+                np.empty((1, 0), dtype=np.float32),
+                np.empty((1, 0), dtype=np.int64),
+                dist,
+                self.ids.data[rows],
+                k,
+            )
+            query_d, query_i = finalize_top_k(best_d, best_i, k, self.metric)
+            distances[qi], labels[qi] = query_d[0], query_i[0]
+        return distances, labels
+
+    def _adc(
+        self, query: np.ndarray, probes: np.ndarray, probe_of_row: np.ndarray, codes: np.ndarray
+    ) -> np.ndarray:
+        """Distances approchées par tables entre les résidus de la requête et des codes PQ.
+
+        Une table (m × 2**nbits) par liste sondée, puis une somme de m lectures par vecteur.
+        """
+        residuals = (query - self.centroids[probes]).reshape(len(probes), self.m, -1)
+        # ||r - c||² = ||r||² - 2 r·c + ||c||², sans matérialiser toutes les différences
+        tables = (
+            np.einsum("pmd,pmd->pm", residuals, residuals)[:, :, None]
+            - 2 * np.einsum("pmd,mkd->pmk", residuals, self.codebooks)
+            + np.einsum("mkd,mkd->mk", self.codebooks, self.codebooks)[None]
+        )
+        # Indexation à plat dans les tables : bien plus rapide qu'un index 3D
+        ksub = tables.shape[2]
+        offsets = (probe_of_row[:, None] * self.m + np.arange(self.m)[None, :]) * ksub
+        return np.take(tables.reshape(-1), offsets + codes).sum(axis=1)[None, :]
+
+
+def default_ids(ids: np.ndarray | None, start: int, n: int) -> np.ndarray:
+    if ids is None:
+        return np.arange(start, start + n, dtype=np.int64)
+    ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+    if len(ids) != n:
+        raise ValueError(f"{n} identifiants attendus, reçu {len(ids)}.")
+    return ids
+
+
+def write_meta(path: Path, meta: dict) -> None:
+    (path / "index.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def prepare_storage(path: Path, meta: dict, runtime: tuple[str, ...] = ()) -> None:
+    """Crée le dossier d'un nouvel index, ou vérifie les paramètres d'un index existant.
+
+    Raises:
+        ValueError: si `path` contient un index aux paramètres différents de `meta`
+            (hors réglages `runtime`).
+    """
+    meta_file = path / "index.json"
+    if not meta_file.exists():
+        path.mkdir(parents=True, exist_ok=True)
+        write_meta(path, meta)
+        return
+
+    stored = json.loads(meta_file.read_text(encoding="utf-8"))
+    differences = [
+        f"{key}={stored.get(key)!r} (demandé : {value!r})"
+        for key, value in meta.items()
+        if key not in runtime and stored.get(key) != value
+    ]
+    if differences:
+        raise ValueError(f"Index existant incompatible dans {path} : {', '.join(differences)}")
+
+
+def open_index(path: Path, block_size: int = DEFAULT_BLOCK_SIZE) -> FlatIndex | IVFIndex:
+    """Rouvre un index stocké dans `path`."""
+    meta = json.loads((path / "index.json").read_text(encoding="utf-8"))
+    kind = meta.pop("kind")
+    if kind == FlatIndex.kind:
+        return FlatIndex(path=path, block_size=block_size, **meta)
+    if kind == IVFIndex.kind:
+        return IVFIndex(path=path, block_size=block_size, **meta)
+    raise ValueError(f"Type d'index inconnu : {kind}")
@@ -0,0 +1,55 @@
+"""Adaptateur Qt de `DuplicateScanJob`.
+
+Le worker vit dans un QThread ; ses signaux sont émis depuis ce thread et
+livrés au thread de l'interface par connexion en file d'attente. `cancel()`
+doit être appelé directement (pas via un signal) : le thread du worker est
+occupé par `run()` et ne traiterait pas l'appel avant la fin du scan.
+"""
+
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+
+from photodedup.application.jobs import DEFAULT_PROGRESS_INTERVAL, DuplicateScanJob
+
+
+class ScanWorker(QObject):
+    progress = Signal(object)  # ProgressEvent
+    finished = Signal(object)  # ScanResult (partiel si annulé)
+    failed = Signal(str)
+
+    def __init__(self, path: Path, interval: float = DEFAULT_PROGRESS_INTERVAL) -> None:
+        super().__init__()
+        self._job = DuplicateScanJob(path, on_progress=self.progress.emit, interval=interval)
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            result = self._job.run()
+        except Exception as e:
+            # Toute erreur doit terminer le thread, sinon l'interface reste « en cours »
+            self.failed.emit(str(e))
+        else:
+            self.finished.emit(result)
+
+    def cancel(self) -> None:
+        self._job.cancel()
+
+
+def start_scan_worker(path: Path, parent: QObject | None = None) -> tuple[QThread, ScanWorker]:
+    """Crée un QThread, y déplace un `ScanWorker` et démarre le scan.
+
+    Le thread et le worker se détruisent d'eux-mêmes à la fin du scan.
+    """
+    thread = QThread(parent)
+    worker = ScanWorker(path)
+    worker.moveToThread(thread)
+
+    thread.started.connect(worker.run)
+    worker.finished.connect(thread.quit)
+    worker.failed.connect(thread.quit)
+    thread.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+
+    thread.start()
+    return thread, worker
@@ -0,0 +1,81 @@
+import hashlib
+from dataclasses import asdict, replace
+
+from benchmarks.__main__ import PROFILES, check_regressions
+from benchmarks.synthetic import LibrarySpec, generate_library
+
+
+def library_digest(root):
+    sha256 = hashlib.sha256()
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        sha256.update(str(path.relative_to(root)).encode())
+        sha256.update(path.read_bytes())
+    return sha256.hexdigest()
+
+
+def make_report(spec, median, profile="small"):
+    return {
+        "meta": {"profile": profile, "spec": asdict(spec)},
+        "results": [{"name": "micro.group_by_size", "median_s": median, "min_s": median}],
+    }
+
+
+class TestGenerateLibrary:
+    def test_deterministic(self, tmp_path):
+        spec = LibrarySpec(file_count=60, min_size=1024, max_size=8192, hardlink_ratio=0.1)
+
+        first = generate_library(tmp_path / "a", spec)
+        second = generate_library(tmp_path / "b", spec)
+
+        assert library_digest(first.root) == library_digest(second.root)
+        assert first.as_dict()["files"] == 60
+        assert first.duplicate_files + first.hardlinks == 18
+
+    def test_seed_changes_content(self, tmp_path):
+        spec = LibrarySpec(file_count=20, min_size=1024, max_size=8192)
+
+        first = generate_library(tmp_path / "a", spec)
+        second = generate_library(tmp_path / "b", replace(spec, seed=7))
+
+        assert library_digest(first.root) != library_digest(second.root)
+
+
+class TestCheckRegressions:
+    thresholds = {"small": {"micro.group_by_size": {"max_median_s": 0.01}}}
+
+    def test_threshold_exceeded(self):
+        report = make_report(PROFILES["small"], 0.5)
+
+        failures = check_regressions(report, self.thresholds, None, 0.25)
+
+        assert len(failures) == 1
+        assert "seuil" in failures[0]
+
+    def test_thresholds_skipped_when_spec_overridden(self):
+        report = make_report(replace(PROFILES["small"], file_count=50_000), 0.5)
+
+        assert check_regressions(report, self.thresholds, None, 0.25) == []
+
+    def test_baseline_regression(self):
+        baseline = make_report(PROFILES["small"], 0.010)
+        report = make_report(PROFILES["small"], 0.020)
+
+        failures = check_regressions(report, {}, baseline, 0.25)
+
+        assert len(failures) == 1
+        assert "référence" in failures[0]
+
+    def test_baseline_noise_below_min_delta(self):
+        baseline = make_report(PROFILES["small"], 0.0001)
+        report = make_report(PROFILES["small"], 0.0003)
+
+        assert check_regressions(report, {}, baseline, 0.25) == []
+        assert len(check_regressions(report, {}, baseline, 0.25, min_delta=0)) == 1
+
+    def test_baseline_with_other_spec_refused(self):
+        baseline = make_report(replace(PROFILES["small"], seed=1), 0.001)
+        report = make_report(PROFILES["small"], 0.001)
+
+        failures = check_regressions(report, {}, baseline, 0.25)
+
+        assert failures == ["référence mesurée sur une autre bibliothèque (spec différente)"]
@@ -0,0 +1,125 @@
+from photodedup.application.jobs import (
+    CancellationToken,
+    DuplicateScanJob,
+    ProgressThrottle,
+    run_in_background,
+)
+from photodedup.infrastructure.hasher import compute_hash
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressThrottle:
+    def test_emit_once_per_interval(self):
+        clock = FakeClock()
+        events = []
+        throttle = ProgressThrottle("scan", events.append, interval=0.1, clock=clock)
+
+        for _ in range(1000):
+            throttle.advance()
+        assert events == []
+
+        clock.now = 0.1
+        throttle.advance(items=["a"])
+        assert len(events) == 1
+        assert events[0].done == 1001
+        assert events[0].batch == ["a"]
+
+    def test_flush_sends_remaining_batch(self):
+        clock = FakeClock()
+        events = []
+        throttle = ProgressThrottle("hash", events.append, total=3, clock=clock)
+        throttle.advance(0, ["g1", "g2"])
+        throttle.flush()
+
+        assert events[-1].batch == ["g1", "g2"]
+        assert events[-1].total == 3
+
+
+class TestCancellationToken:
+    def test_cancel(self):
+        token = CancellationToken()
+        assert token.cancelled is False
+        token.cancel()
+        assert token.cancelled is True
+
+
+class TestDuplicateScanJob:
+    def test_find_duplicates(self, tmp_path):
+        for name, data in [("a.jpg", b"AAAA"), ("b.jpg", b"AAAA"), ("c.jpg", b"BBBB")]:
+            (tmp_path / name).write_bytes(data)
+        events = []
+
+        result = DuplicateScanJob(tmp_path, on_progress=events.append).run()
+
+        assert result.cancelled is False
+        assert len(result.images) == 3
+        assert len(result.groups) == 1
+        assert {e.phase for e in events} == {"scan", "hash"}
+        assert sum(len(e.batch) for e in events) == 1
+
+    def test_cancel_during_hash_keeps_partial_results(self, tmp_path):
+        for i in range(4):
+            (tmp_path / f"photo{i}.jpg").write_bytes(b"A" * 10)
+        job = None
+        calls = []
+
+        def hasher(path):
+            calls.append(path)
+            job.cancel()
+            return compute_hash(path)
+
+        job = DuplicateScanJob(tmp_path, hasher=hasher)
+        result = job.run()
+
+        assert result.cancelled is True
+        assert len(result.images) == 4
+        assert len(calls) == 1
+        assert result.groups == []
+
+    def test_cancel_during_scan_keeps_partial_results(self, tmp_path):
+        for i in range(5):
+            (tmp_path / f"photo{i}.jpg").write_bytes(b"A" * 10)
+        job = None
+
+        def on_progress(event):
+            if event.phase == "scan":
+                job.cancel()
+
+        job = DuplicateScanJob(tmp_path, on_progress=on_progress, interval=0)
+        result = job.run()
+
+        assert result.cancelled is True
+        assert 0 < len(result.images) < 5
+        assert result.groups == []
+
+    def test_unreadable_file_counted_in_progress(self, tmp_path):
+        for i in range(3):
+            (tmp_path / f"photo{i}.jpg").write_bytes(b"A" * 10)
+        events = []
+
+        def hasher(path):
+            if path.name == "photo1.jpg":
+                raise PermissionError(13, "Permission refusée", str(path))
+            return compute_hash(path)
+
+        result = DuplicateScanJob(tmp_path, hasher=hasher, on_progress=events.append).run()
+
+        assert len(result.groups) == 1
+        assert events[-1].phase == "hash"
+        assert events[-1].done == events[-1].total == 3
+
+    def test_run_in_background(self, tmp_path):
+        (tmp_path / "photo.jpg").write_bytes(b"A")
+
+        handle = run_in_background(DuplicateScanJob(tmp_path))
+
+        assert handle.wait(timeout=5)
+        assert handle.error is None
+        assert len(handle.result.images) == 1
@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+
+from photodedup.__main__ import main
+
+
+def make_library(root):
+    for name in ("a.jpg", "b.jpg"):
+        (root / name).write_bytes(b"same jpg data")
+    (root / "c.jpg").write_bytes(b"other jpg data")
+    (root / "notes.txt").write_bytes(b"text")
+    return root
+
+
+class TestReportOptions:
+    def test_ndjson_to_file(self, tmp_path):
+        library = tmp_path / "photos"
+        library.mkdir()
+        make_library(library)
+        output = tmp_path / "report.ndjson"
+
+        assert main([str(library), "--format", "ndjson", "--output", str(output)]) == 0
+
+        records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert [r["type"] for r in records] == ["skipped_file", "group", "summary"]
+        assert records[1]["count"] == 2
+
+    def test_csv_top_to_stdout(self, tmp_path, capsys):
+        library = make_library(tmp_path)
+
+        assert main([str(library), "--format", "csv", "--top", "1"]) == 0
+
+        rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+        assert [r["type"] for r in rows] == ["skipped_file", "group", "group"]
+
+    def test_output_requires_format(self, tmp_path, capsys):
+        assert main([str(tmp_path), "--output", str(tmp_path / "report.csv")]) == 1
+        assert "nécessitent --format" in capsys.readouterr().out
+
+    def test_top_requires_format(self, tmp_path, capsys):
+        assert main([str(tmp_path), "--top", "3"]) == 1
+        assert "nécessitent --format" in capsys.readouterr().out
+
+    def test_unwritable_output(self, tmp_path, capsys):
+        library = make_library(tmp_path)
+
+        # Un dossier ne peut pas être ouvert en écriture
+        assert main([str(library), "--format", "ndjson", "--output", str(tmp_path)]) == 1
+        assert "écriture du rapport impossible" in capsys.readouterr().err
@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from photodedup.domain.models import DuplicateGroup, ImageFile
+from photodedup.infrastructure.report_writer import (
+    CsvReportWriter,
+    NdjsonReportWriter,
+    ReportWriter,
+    TopKGroups,
+    open_report,
+)
+
+
+class TestTopKGroups:
+    def test_keep_biggest(self):
+        top = TopKGroups(2)
+        for size in (100, 500, 300, 50):
+            top.push(make_group(size))
+
+        assert [g.wasted_space for g in top.sorted()] == [500, 300]
+
+    def test_ties_keep_first_seen(self):
+        top = TopKGroups(1)
+        first = make_group(100, "a")
+        top.push(first)
+        top.push(make_group(100, "b"))
+
+        assert top.sorted() == [first]
+
+    def test_invalid_k(self):
+        with pytest.raises(ValueError):
+            TopKGroups(0)
+
+
+class TestNdjsonReportWriter:
+    def test_stream_records(self):
+        stream = io.StringIO()
+        writer = NdjsonReportWriter(stream)
+
+        writer.write_group(make_group(1000))
+        # Le groupe est écrit immédiatement, avant la fermeture
+        assert stream.getvalue().count("\n") == 1
+
+        writer.write_error("Fichier - Permission refusée : /x.jpg")
+        writer.write_skipped_file(Path("/fake/doc.pdf"))
+        writer.close()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [r["type"] for r in records] == ["group", "error", "skipped_file", "summary"]
+        assert records[0]["count"] == 2
+        assert records[0]["wasted_space"] == 1000
+        assert records[-1]["groups"] == 1
+        assert records[-1]["skipped"] == 1
+
+    def test_top_k_written_on_close(self):
+        stream = io.StringIO()
+        writer = NdjsonReportWriter(stream, top_k=2)
+        writer.write_groups(make_group(size) for size in (10, 30, 20))
+
+        assert stream.getvalue() == ""
+
+        writer.close()
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [r["wasted_space"] for r in records if r["type"] == "group"] == [30, 20]
+        assert records[-1]["groups"] == 3
+        assert records[-1]["wasted_space"] == 60
+
+
+class TestCsvReportWriter:
+    def test_one_row_per_file(self):
+        stream = io.StringIO()
+        writer = CsvReportWriter(stream)
+        writer.write_group(make_group(1000))
+        writer.write_skipped_folder(Path("/fake/.cache"))
+        writer.close()
+
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        assert [r["type"] for r in rows] == ["group", "group", "skipped_folder"]
+        assert rows[0]["group"] == rows[1]["group"] == "1"
+        assert rows[0]["detection"] == "exact"
+        assert rows[2]["path"] == "/fake/.cache"
+
+
+class TestReportWriter:
+    def test_abstract(self):
+        with pytest.raises(TypeError):
+            ReportWriter(io.StringIO())
+
+
+class TestOpenReport:
+    def test_write_to_file(self, tmp_path):
+        output = tmp_path / "report.ndjson"
+        with open_report("ndjson", output) as report:
+            report.write_group(make_group(1000))
+
+        assert len(output.read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            with open_report("xml"):
+                pass
+
+
+def make_group(size, hash="abc"):
+    images = [
+        ImageFile(Path(f"/fake/{hash}_{i}.jpg"), size, datetime(2026, 1, 15, 10, 30, 0))
+        for i in range(2)
+    ]
+    return DuplicateGroup(hash, images, "exact")
@@ -0,0 +1,34 @@
+import pytest
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from photodedup.ui.workers.scan_worker import ScanWorker  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+class TestScanWorker:
+    def test_unexpected_error_emits_failed(self, app, tmp_path, monkeypatch):
+        worker = ScanWorker(tmp_path)
+        failed, finished = [], []
+        worker.failed.connect(failed.append)
+        worker.finished.connect(finished.append)
+
+        def boom():
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(worker._job, "run", boom)
+        worker.run()
+
+        assert failed == ["boom"]
+        assert finished == []
+
+    def test_cancel_forwarded_to_job(self, app, tmp_path):
+        worker = ScanWorker(tmp_path)
+
+        worker.cancel()
+
+        assert worker._job.token.cancelled is True
@@ -1,6 +1,6 @@
 from photodedup.domain.models import ImageFile
 from photodedup.domain.services import find_exact_duplicates, group_by_size
-from photodedup.infrastructure.hasher import compute_hash
+from photodedup.infrastructure.hasher import compute_hash, compute_partial_hash
 
 
 class TestGroupBySize:
@@ -81,6 +81,26 @@ class TestFindExactDuplicates:
         assert len(duplicates[0].imagefiles) == 2
         assert len(duplicates[1].imagefiles) == 3
 
+    def test_groups_never_mix_sizes(self, tmp_path):
+        """Deux tailles différentes au même hash partiel forment deux groupes."""
+        files_data = [
+            ("photo1.jpg", b"A" * 4096 + b"1"),
+            ("photo2.jpg", b"A" * 4096 + b"2"),
+            ("photo3.jpg", b"A" * 4096 + b"33"),
+            ("photo4.jpg", b"A" * 4096 + b"44"),
+        ]
+
+        images = []
+        for name, fbytes in files_data:
+            path = tmp_path / name
+            path.write_bytes(fbytes)
+            images.append(ImageFile.from_path(path))
+
+        duplicates = find_exact_duplicates(images, compute_partial_hash)
+
+        assert len(duplicates) == 2
+        assert all(len({img.size for img in d.imagefiles}) == 1 for d in duplicates)
+
 
 class TestDuplicateGroup:
     def test_duplicate_group_proprieties(self, tmp_path):
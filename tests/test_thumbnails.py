@@ -0,0 +1,138 @@
+import io
+import os
+from pathlib import Path
+
+from PIL import Image
+
+from photodedup.infrastructure.thumbnails import MemoryLRU, ThumbnailCache
+
+
+class TestMemoryLRU:
+    def test_evict_least_recently_used(self):
+        lru = MemoryLRU(max_bytes=10)
+        lru.put("a", b"aaaa")
+        lru.put("b", b"bbbb")
+        lru.get("a")
+        lru.put("c", b"cccc")
+
+        assert "a" in lru
+        assert "b" not in lru
+        assert lru.total == 8
+
+    def test_value_too_big(self):
+        lru = MemoryLRU(max_bytes=2)
+        lru.put("a", b"aaaa")
+
+        assert len(lru) == 0
+
+
+class TestThumbnailCache:
+    def test_generate_thumbnail(self, tmp_path):
+        photo = make_photo(tmp_path / "photo.jpg", (1600, 1200))
+
+        with ThumbnailCache(tmp_path / "cache", size=128, workers=0) as cache:
+            data = cache.get("ab12cd34", photo)
+
+            assert cache.path_for("ab12cd34") == tmp_path / "cache/ab/12/ab12cd34-128.jpg"
+            assert cache.path_for("ab12cd34").exists()
+        with Image.open(io.BytesIO(data)) as thumb:
+            assert thumb.format == "JPEG"
+            assert max(thumb.size) == 128
+
+    def test_duplicates_share_one_entry(self, tmp_path):
+        first = make_photo(tmp_path / "a.jpg", (400, 300))
+        second = make_photo(tmp_path / "b.jpg", (400, 300))
+
+        with ThumbnailCache(tmp_path / "cache", workers=0) as cache:
+            futures = cache.prefetch([("ab12cd34", first), ("ab12cd34", second)])
+
+            assert len(futures) == 2
+            assert len(list((tmp_path / "cache").rglob("*.jpg"))) == 1
+
+    def test_reuse_disk_cache(self, tmp_path):
+        photo = make_photo(tmp_path / "photo.jpg", (400, 300))
+        with ThumbnailCache(tmp_path / "cache", workers=0) as cache:
+            data = cache.get("ab12cd34", photo)
+        photo.unlink()
+
+        with ThumbnailCache(tmp_path / "cache", workers=0) as cache:
+            assert cache.disk_bytes == len(data)
+            assert cache.get("ab12cd34", photo) == data
+
+    def test_unreadable_image(self, tmp_path):
+        broken = tmp_path / "broken.jpg"
+        broken.write_bytes(b"not a jpg")
+
+        with ThumbnailCache(tmp_path / "cache", workers=0) as cache:
+            assert cache.get("ab12cd34", broken) is None
+
+    def test_unreadable_cache_file(self, tmp_path, monkeypatch):
+        photo = make_photo(tmp_path / "photo.jpg", (400, 300))
+
+        with ThumbnailCache(tmp_path / "cache", workers=0) as cache:
+            cache.get("ab12cd34", photo)
+            cache.memory = MemoryLRU(cache.memory.max_bytes)
+            disk_bytes = cache.disk_bytes
+
+            def denied(self):
+                raise PermissionError(13, "Permission refusée", str(self))
+
+            monkeypatch.setattr(Path, "read_bytes", denied)
+            assert cache.get("ab12cd34", photo) is None
+            assert cache.disk_bytes == disk_bytes
+
+    def test_disk_eviction(self, tmp_path):
+        photo = make_photo(tmp_path / "photo.jpg", (400, 300))
+
+        with ThumbnailCache(tmp_path / "cache", workers=0) as cache:
+            one = len(cache.get("aa000000", photo))
+            cache.max_disk_bytes = one * 2
+            cache.get("bb000000", photo)
+            cache.get("cc000000", photo)
+
+            assert cache.disk_bytes <= cache.max_disk_bytes
+            assert not cache.path_for("aa000000").exists()
+            assert cache.path_for("cc000000").exists()
+
+    def test_memory_hit_protects_from_eviction(self, tmp_path):
+        photo = make_photo(tmp_path / "photo.jpg", (400, 300))
+
+        with ThumbnailCache(tmp_path / "cache", workers=0) as cache:
+            one = len(cache.get("aa000000", photo))
+            # Place pour deux miniatures et demie : la troisième en évince une seule
+            cache.max_disk_bytes = one * 5 // 2
+            cache.get("bb000000", photo)
+            assert "aa000000-256" in cache.memory
+            cache.get("aa000000", photo)
+            cache.get("cc000000", photo)
+
+            assert cache.path_for("aa000000").exists()
+            assert not cache.path_for("bb000000").exists()
+
+    def test_memory_hits_persisted_on_close(self, tmp_path):
+        photo = make_photo(tmp_path / "photo.jpg", (400, 300))
+        cache = ThumbnailCache(tmp_path / "cache", workers=0)
+        cache.get("ab12cd34", photo)
+        path = cache.path_for("ab12cd34")
+        os.utime(path, (0, 0))
+
+        cache.get("ab12cd34", photo)
+        assert path.stat().st_mtime == 0
+        cache.close()
+
+        assert path.stat().st_mtime > 0
+
+    def test_process_pool(self, tmp_path):
+        photos = [make_photo(tmp_path / f"p{i}.png", (300, 200), "RGBA") for i in range(3)]
+
+        with ThumbnailCache(tmp_path / "cache", workers=1) as cache:
+            futures = cache.prefetch((f"{i:02d}ffffff", p) for i, p in enumerate(photos))
+            for future in futures:
+                future.result(timeout=30)
+
+            assert all(cache.get(f"{i:02d}ffffff", p) for i, p in enumerate(photos))
+
+
+def make_photo(path, size, mode="RGB"):
+    Image.new(mode, size, (200, 100, 50, 255)[: len(mode)]).save(path)
+    return path
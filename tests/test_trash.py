@@ -0,0 +1,208 @@
+import stat
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from photodedup.domain.models import ImageFile
+from photodedup.infrastructure import trash
+from photodedup.infrastructure.trash import RemovalExecutor, RemovalRequest
+
+
+@pytest.fixture
+def executor(tmp_path):
+    return RemovalExecutor(tmp_path / "journal.jsonl", home_trash=tmp_path / "Trash")
+
+
+class TestTrash:
+    def test_trash_moves_file_and_writes_info(self, tmp_path, executor):
+        photo = make_photo(tmp_path / "photos" / "photo 1.jpg")
+
+        batch, outcomes = executor.remove([request_for(photo)])
+
+        assert [o.status for o in outcomes] == ["trashed"]
+        assert not photo.exists()
+        assert (tmp_path / "Trash" / "files" / "photo 1.jpg").read_bytes() == b"fake jpg"
+        info = (tmp_path / "Trash" / "info" / "photo 1.jpg.trashinfo").read_text()
+        assert info.startswith("[Trash Info]\n")
+        assert f"Path={photo.parent.resolve()}/photo%201.jpg" in info
+        assert "DeletionDate=" in info
+
+    def test_name_collision(self, tmp_path, executor):
+        first = make_photo(tmp_path / "a" / "photo.jpg")
+        second = make_photo(tmp_path / "b" / "photo.jpg")
+
+        _, outcomes = executor.remove([request_for(first), request_for(second)])
+
+        assert {o.trashed_path.name for o in outcomes} == {"photo.jpg", "photo.2.jpg"}
+        assert (tmp_path / "Trash" / "info" / "photo.2.jpg.trashinfo").exists()
+
+    def test_changed_file_is_kept(self, tmp_path, executor):
+        photo = make_photo(tmp_path / "photo.jpg")
+        request = request_for(photo)
+        photo.write_bytes(b"modified since scan")
+
+        _, outcomes = executor.remove([request])
+
+        assert outcomes[0].status == "changed"
+        assert photo.exists()
+
+    def test_missing_file(self, tmp_path, executor):
+        request = RemovalRequest(tmp_path / "gone.jpg", 10, datetime(2026, 1, 15))
+
+        _, outcomes = executor.remove([request])
+
+        assert outcomes[0].status == "missing"
+
+    def test_changed_after_reservation(self, tmp_path, executor, monkeypatch):
+        photo = make_photo(tmp_path / "photo.jpg")
+        reserve = trash.reserve_trash_name
+
+        def reserve_then_modify(location, path, deleted_at):
+            target = reserve(location, path, deleted_at)
+            path.write_bytes(b"modified during the batch")
+            return target
+
+        monkeypatch.setattr(trash, "reserve_trash_name", reserve_then_modify)
+        _, outcomes = executor.remove([request_for(photo)])
+
+        assert outcomes[0].status == "changed"
+        assert photo.exists()
+        assert list((tmp_path / "Trash" / "info").iterdir()) == []
+
+    def test_trash_created_private(self, tmp_path, executor):
+        executor.remove([request_for(make_photo(tmp_path / "photo.jpg"))])
+
+        for directory in ("", "files", "info"):
+            mode = (tmp_path / "Trash" / directory).stat().st_mode
+            assert stat.S_IMODE(mode) == 0o700
+
+    def test_symlinked_trash_refused(self, tmp_path, executor):
+        elsewhere = tmp_path / "elsewhere"
+        elsewhere.mkdir()
+        (tmp_path / "Trash").symlink_to(elsewhere)
+        photo = make_photo(tmp_path / "photo.jpg")
+
+        _, outcomes = executor.remove([request_for(photo)])
+
+        assert outcomes[0].status == "error"
+        assert "Corbeille indisponible" in outcomes[0].message
+        assert photo.exists()
+        assert list(elsewhere.iterdir()) == []
+
+    def test_batches(self, tmp_path):
+        executor = RemovalExecutor(
+            tmp_path / "journal.jsonl", batch_size=2, home_trash=tmp_path / "Trash"
+        )
+        photos = [make_photo(tmp_path / f"photo{i}.jpg") for i in range(5)]
+
+        _, outcomes = executor.remove([request_for(p) for p in photos])
+
+        assert all(o.status == "trashed" for o in outcomes)
+        assert len(list((tmp_path / "Trash" / "files").iterdir())) == 5
+
+
+class TestUndo:
+    def test_undo_last_batch(self, tmp_path, executor):
+        photos = [make_photo(tmp_path / "photos" / f"photo{i}.jpg") for i in range(3)]
+        executor.remove([request_for(p) for p in photos])
+
+        outcomes = executor.undo()
+
+        assert [o.status for o in outcomes] == ["restored"] * 3
+        assert all(p.read_bytes() == b"fake jpg" for p in photos)
+        assert list((tmp_path / "Trash" / "info").iterdir()) == []
+
+    def test_undo_twice_is_noop(self, tmp_path, executor):
+        photo = make_photo(tmp_path / "photo.jpg")
+        batch, _ = executor.remove([request_for(photo)])
+
+        executor.undo(batch)
+
+        assert executor.undo(batch) == []
+        assert photo.exists()
+
+    def test_undo_after_name_reused(self, tmp_path, executor):
+        photo = make_photo(tmp_path / "photo.jpg")
+        executor.remove([request_for(photo)])
+        executor.undo()
+
+        # Le second lot réutilise le même nom dans la corbeille
+        batch, outcomes = executor.remove([request_for(photo)])
+        assert outcomes[0].trashed_path.name == "photo.jpg"
+
+        assert [o.status for o in executor.undo(batch)] == ["restored"]
+        assert photo.exists()
+
+    def test_undo_skips_aborted_entry(self, tmp_path, executor, monkeypatch):
+        first = make_photo(tmp_path / "d1" / "IMG.jpg")
+        second = tmp_path / "d2" / "IMG.jpg"
+        second.parent.mkdir()
+        second.write_bytes(b"other file B")
+        reserve = trash.reserve_trash_name
+
+        def reserve_then_modify(location, path, deleted_at):
+            target = reserve(location, path, deleted_at)
+            path.write_bytes(b"modified during the batch")
+            return target
+
+        monkeypatch.setattr(trash, "reserve_trash_name", reserve_then_modify)
+        first_batch, outcomes = executor.remove([request_for(first)])
+        assert outcomes[0].status == "changed"
+        monkeypatch.undo()
+        first.unlink()
+
+        # Le second lot reprend le nom libéré par le premier
+        second_batch, outcomes = executor.remove([request_for(second)])
+        assert outcomes[0].trashed_path.name == "IMG.jpg"
+
+        assert executor.undo(first_batch) == []
+        assert not first.exists()
+        assert [o.status for o in executor.undo(second_batch)] == ["restored"]
+        assert second.read_bytes() == b"other file B"
+
+    def test_undo_refuses_other_file_in_trash(self, tmp_path, executor):
+        photo = make_photo(tmp_path / "photo.jpg")
+        _, outcomes = executor.remove([request_for(photo)])
+        outcomes[0].trashed_path.write_bytes(b"not the trashed photo")
+
+        outcomes = executor.undo()
+
+        assert outcomes[0].status == "conflict"
+        assert not photo.exists()
+
+    def test_undo_conflict(self, tmp_path, executor):
+        photo = make_photo(tmp_path / "photo.jpg")
+        executor.remove([request_for(photo)])
+        photo.write_bytes(b"new file")
+
+        outcomes = executor.undo()
+
+        assert outcomes[0].status == "conflict"
+        assert photo.read_bytes() == b"new file"
+
+
+class TestDelete:
+    def test_delete_mode(self, tmp_path):
+        executor = RemovalExecutor(tmp_path / "journal.jsonl", mode="delete")
+        photo = make_photo(tmp_path / "photo.jpg")
+
+        _, outcomes = executor.remove([request_for(photo)])
+
+        assert outcomes[0].status == "deleted"
+        assert not photo.exists()
+        assert executor.undo() == []
+
+    def test_invalid_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            RemovalExecutor(tmp_path / "journal.jsonl", mode="shred")
+
+
+def make_photo(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"fake jpg")
+    return path
+
+
+def request_for(path: Path) -> RemovalRequest:
+    return RemovalRequest.from_image(ImageFile.from_path(path))
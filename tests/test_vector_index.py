@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+
+from photodedup.infrastructure.vector_index import FlatIndex, IVFIndex, kmeans, open_index
+
+
+def clustered_vectors(n=2000, d=16, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, d)) * 10
+    return (centers[rng.integers(0, clusters, n)] + rng.normal(size=(n, d))).astype(np.float32)
+
+
+def brute_force(x, queries, k):
+    distances = ((queries[:, None, :] - x[None, :, :]) ** 2).sum(axis=2)
+    return np.argsort(distances, axis=1)[:, :k]
+
+
+class TestFlatIndex:
+    def test_exact_search(self):
+        x = clustered_vectors()
+        queries = x[:20] + 0.01
+        index = FlatIndex(16, block_size=128)
+        index.add(x)
+
+        distances, labels = index.search(queries, 5)
+
+        assert index.ntotal == 2000
+        assert (labels == brute_force(x, queries, 5)).all()
+        assert (np.diff(distances, axis=1) >= 0).all()
+
+    def test_inner_product(self):
+        index = FlatIndex(2, metric="ip")
+        index.add(np.array([[1, 0], [0, 1], [2, 0]]))
+
+        distances, labels = index.search(np.array([1, 0]), 2)
+
+        assert labels.tolist() == [[2, 0]]
+        assert distances.tolist() == [[2.0, 1.0]]
+
+    def test_custom_ids_and_missing_results(self):
+        index = FlatIndex(2)
+        index.add(np.array([[0, 0], [1, 1]]), ids=np.array([10, 20]))
+
+        distances, labels = index.search(np.array([0, 0]), 3)
+
+        assert labels.tolist() == [[10, 20, -1]]
+        assert np.isinf(distances[0, 2])
+
+    def test_invalid_k(self):
+        index = FlatIndex(4)
+        index.add(np.zeros((2, 4)))
+
+        with pytest.raises(ValueError):
+            index.search(np.zeros(4), 0)
+
+    def test_wrong_dimension(self):
+        with pytest.raises(ValueError):
+            FlatIndex(4).add(np.zeros((2, 3)))
+
+    def test_memory_mapped_storage(self, tmp_path):
+        x = clustered_vectors()
+        index = FlatIndex(16, path=tmp_path / "flat")
+        index.add(x[:1000])
+        index.add(x[1000:])
+
+        reopened = open_index(tmp_path / "flat")
+
+        assert isinstance(reopened.vectors.data, np.memmap)
+        assert reopened.ntotal == 2000
+        assert (reopened.search(x[:5], 1)[1][:, 0] == np.arange(5)).all()
+
+    def test_existing_index_with_other_parameters(self, tmp_path):
+        FlatIndex(8, path=tmp_path / "flat").add(np.zeros((3, 8)))
+
+        with pytest.raises(ValueError):
+            FlatIndex(16, path=tmp_path / "flat")
+
+        assert open_index(tmp_path / "flat").ntotal == 3
+
+
+class TestIVFIndex:
+    def test_recall(self):
+        x = clustered_vectors()
+        queries = x[:50] + 0.01
+        index = IVFIndex(16, nlist=20, nprobe=4)
+        index.train(x)
+        index.add(x)
+
+        _, labels = index.search(queries, 10)
+
+        expected = brute_force(x, queries, 10)
+        recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(labels, expected)])
+        assert recall > 0.9
+
+    def test_product_quantization(self):
+        x = clustered_vectors()
+        index = IVFIndex(16, nlist=20, nprobe=4, m=4, nbits=6)
+        index.train(x)
+        index.add(x)
+
+        _, labels = index.search(x[:50], 10)
+
+        assert index.payload.data.dtype == np.uint8
+        assert np.mean([i in row for i, row in enumerate(labels)]) > 0.8
+
+    def test_untrained(self):
+        with pytest.raises(RuntimeError):
+            IVFIndex(16, nlist=4).add(np.zeros((1, 16)))
+
+    def test_invalid_pq(self):
+        with pytest.raises(ValueError):
+            IVFIndex(16, m=5)
+
+    def test_bad_ids_leave_index_consistent(self, tmp_path):
+        x = clustered_vectors()
+        index = IVFIndex(16, nlist=20, path=tmp_path / "ivf")
+        index.train(x)
+        index.add(x)
+
+        with pytest.raises(ValueError):
+            index.add(x[:10], ids=np.arange(5))
+        with pytest.raises(ValueError):
+            index.search(x[:1], 0)
+
+        reopened = open_index(tmp_path / "ivf")
+        assert reopened.payload.count == reopened.ids.count == 2000
+        assert (reopened.search(x[:5], 1)[1][:, 0] == np.arange(5)).all()
+
+    def test_reopen(self, tmp_path):
+        x = clustered_vectors()
+        index = IVFIndex(16, nlist=20, nprobe=4, m=4, nbits=6, path=tmp_path / "ivf")
+        index.train(x)
+        index.add(x)
+        expected = index.search(x[:10], 5)
+
+        reopened = open_index(tmp_path / "ivf")
+
+        assert reopened.ntotal == 2000
+        assert (reopened.search(x[:10], 5)[1] == expected[1]).all()
+        # nprobe peut être changé à la réouverture, pas la structure de l'index
+        assert IVFIndex(16, nlist=20, nprobe=8, m=4, nbits=6, path=tmp_path / "ivf").ntotal == 2000
+        with pytest.raises(ValueError):
+            IVFIndex(16, nlist=32, m=4, nbits=6, path=tmp_path / "ivf")
+
+
+class TestKmeans:
+    def test_not_enough_points(self):
+        with pytest.raises(ValueError):
+            kmeans(np.zeros((3, 2), dtype=np.float32), 4)